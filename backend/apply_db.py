@@ -2,13 +2,31 @@
 from __future__ import annotations
 import os
 import json
+import time
+import socket
 import sqlite3
+import threading
+import uuid
+import hashlib
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Optional, Dict, Any, List, Tuple
+from typing import Optional, Dict, Any, List, Tuple, Iterator
 
 # -------------------- Config & helpers --------------------
 DB_PATH = os.getenv("APPLY_DB_PATH", "data/apply.sqlite3")
 os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
+# the API process and the worker container write the same file: wait on a
+# lock instead of failing with "database is locked"
+BUSY_TIMEOUT_MS = int(os.getenv("APPLY_DB_BUSY_TIMEOUT_MS", "5000"))
+CACHE_KIB = int(os.getenv("APPLY_DB_CACHE_KIB", "8192"))
+STATEMENT_CACHE = 256   # prepared statements kept per connection
+
+# A claimed task is leased to one worker. The worker heartbeats to extend the
+# lease; if it dies, the lease runs out and reap_expired() re-queues the task.
+LEASE_SEC = float(os.getenv("APPLY_LEASE_SEC", "300"))
+MAX_ATTEMPTS = int(os.getenv("APPLY_MAX_ATTEMPTS", "2"))
+WORKER_ID = os.getenv("APPLY_WORKER_ID") or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
 
 VALID_STATUSES = {
     "QUEUED", "IN_PROGRESS", "DRAFTED", "SUBMITTED", "DONE", "FAILED", "CANCELLED"
@@ -23,6 +41,14 @@ REQUIRED_APP_COLUMNS: Dict[str, str] = {
     "job_json": "TEXT NOT NULL",
     "created_at": "TEXT NOT NULL",
     "updated_at": "TEXT NOT NULL",
+    "idempotency_key": "TEXT",    # see idempotency_key(); unique, so a posting is queued once
+    # latest task's state, kept in sync by the tasks triggers (see _ensure_triggers)
+    "latest_task_id": "INTEGER",
+    "status": "TEXT NOT NULL DEFAULT 'QUEUED'",
+    "attempts": "INTEGER NOT NULL DEFAULT 0",
+    "error": "TEXT",
+    "artifacts_json": "TEXT",
+    "task_updated_at": "TEXT",    # latest task's updated_at; the row's own updated_at is untouched
 }
 
 REQUIRED_TASK_COLUMNS: Dict[str, str] = {
@@ -32,13 +58,103 @@ REQUIRED_TASK_COLUMNS: Dict[str, str] = {
     "attempts": "INTEGER NOT NULL DEFAULT 0",
     "error": "TEXT",
     "artifacts_json": "TEXT",  # JSON blob with screenshot_url, snapshot_url, confirmation, etc.
+    "lease_owner": "TEXT",         # worker that claimed the task last
+    "lease_expires_at": "REAL",    # epoch seconds; set only while IN_PROGRESS
     "created_at": "TEXT NOT NULL",
     "updated_at": "TEXT NOT NULL",
 }
 
+_local = threading.local()
+
+def _open() -> sqlite3.Connection:
+    c = sqlite3.connect(DB_PATH, isolation_level=None, check_same_thread=False,
+                        timeout=BUSY_TIMEOUT_MS / 1000, cached_statements=STATEMENT_CACHE)
+    c.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS};")
+    c.execute("PRAGMA journal_mode=WAL;")       # readers never block the writer
+    c.execute("PRAGMA synchronous=NORMAL;")     # durable at checkpoints; safe with WAL
+    c.execute(f"PRAGMA cache_size=-{CACHE_KIB};")
+    c.execute("PRAGMA temp_store=MEMORY;")
+    return c
+
 def _conn() -> sqlite3.Connection:
-    # autocommit mode; usable across threads in our simple worker
-    return sqlite3.connect(DB_PATH, isolation_level=None, check_same_thread=False)
+    """
+    This thread's connection (autocommit mode), opened once and reused.
+    Keyed by pid and path so a forked child or a changed APPLY_DB_PATH gets its own.
+    """
+    key = (os.getpid(), DB_PATH)
+    c = getattr(_local, "conn", None)
+    if c is None or getattr(_local, "key", None) != key:
+        c = _local.conn = _open()
+        _local.key = key
+    return c
+
+def _discard(c: sqlite3.Connection) -> None:
+    """Drop this thread's connection (after a failed ROLLBACK its state is unknown)."""
+    if getattr(_local, "conn", None) is c:
+        _local.conn = None
+    try:
+        c.close()
+    except Exception:
+        pass
+
+@contextmanager
+def _tx(nested: bool = False) -> Iterator[sqlite3.Connection]:
+    """
+    One write transaction on this thread's connection (BEGIN IMMEDIATE: takes
+    the write lock up front). Any failure, COMMIT included, rolls back, so the
+    connection never stays inside a transaction. nested=True runs the body in
+    a SAVEPOINT inside the caller's open transaction instead.
+    """
+    c = _conn()
+    if nested:
+        c.execute("SAVEPOINT nested_tx")
+        try:
+            yield c
+            c.execute("RELEASE nested_tx")
+        except BaseException:
+            c.execute("ROLLBACK TO nested_tx")
+            c.execute("RELEASE nested_tx")
+            raise
+        return
+    if c.in_transaction:
+        raise RuntimeError("apply_db: transaction already open on this thread; use _tx(nested=True)")
+    c.execute("BEGIN IMMEDIATE")
+    try:
+        yield c
+        c.execute("COMMIT")
+    except BaseException:
+        try:
+            if c.in_transaction:
+                c.execute("ROLLBACK")
+        except Exception:
+            _discard(c)
+        raise
+
+# query params that only track where a click came from. Not gh_jid: on
+# custom Greenhouse career pages it is the only thing telling postings apart.
+_TRACKING_PARAMS = {"gh_src", "lever-source", "lever-origin", "ref", "referrer"}
+# bump when idempotency_key() changes; init_apply re-keys existing rows
+IDEMPOTENCY_KEY_VERSION = 2
+
+def idempotency_key(job: Dict[str, Any]) -> str:
+    """
+    Dedupe key for a posting: its job id (connectors prefix it with the
+    source and board, e.g. gh-<board>-<id>), else its normalized URL
+    (scheme/host case, fragment, trailing slash and tracking params ignored),
+    else a hash of the payload.
+    """
+    if job.get("id"):
+        return f"id:{job['id']}"
+    url = (job.get("url") or "").strip()
+    if url:
+        parts = urlsplit(url)
+        query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+                 if not k.lower().startswith("utm_") and k.lower() not in _TRACKING_PARAMS]
+        norm = urlunsplit(((parts.scheme or "https").lower(), parts.netloc.lower(),
+                           parts.path.rstrip("/"), urlencode(sorted(query)), ""))
+        return f"url:{norm}"
+    raw = json.dumps(job or {}, sort_keys=True).encode("utf-8")
+    return f"sha1:{hashlib.sha1(raw).hexdigest()}"
 
 def _now() -> str:
     return datetime.utcnow().isoformat() + "Z"
@@ -76,98 +192,239 @@ def _ensure_indexes(c: sqlite3.Connection) -> None:
         c.execute("CREATE INDEX IF NOT EXISTS idx_tasks_updated ON tasks(updated_at);")
     except Exception:
         pass
+    try:
+        c.execute("CREATE INDEX IF NOT EXISTS idx_tasks_lease ON tasks(status, lease_expires_at);")
+    except Exception:
+        pass
+    # /applications filters, newest first (keyset on id)
+    try:
+        c.execute("CREATE INDEX IF NOT EXISTS idx_apps_status ON applications(status, id);")
+        c.execute("CREATE INDEX IF NOT EXISTS idx_apps_portal ON applications(portal, id);")
+        c.execute("CREATE INDEX IF NOT EXISTS idx_apps_company ON applications(company COLLATE NOCASE, id);")
+    except Exception:
+        pass
+    c.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_apps_idem ON applications(idempotency_key) "
+              "WHERE idempotency_key IS NOT NULL;")
+
+def _backfill_keys(c: sqlite3.Connection) -> None:
+    """
+    Key applications queued before idempotency keys existed (or under an older
+    key scheme, which are re-keyed from scratch); older duplicates keep a NULL key.
+    """
+    if c.execute("PRAGMA user_version").fetchone()[0] < IDEMPOTENCY_KEY_VERSION:
+        c.execute("UPDATE applications SET idempotency_key=NULL WHERE idempotency_key IS NOT NULL")
+        c.execute(f"PRAGMA user_version={IDEMPOTENCY_KEY_VERSION}")
+    rows = c.execute("SELECT id, job_json FROM applications WHERE idempotency_key IS NULL ORDER BY id").fetchall()
+    if not rows:
+        return
+    taken = {r[0] for r in c.execute("SELECT idempotency_key FROM applications WHERE idempotency_key IS NOT NULL")}
+    updates = []
+    for app_id, job_json in rows:
+        key = idempotency_key(_loads(job_json))
+        if key not in taken:
+            taken.add(key)
+            updates.append((key, app_id))
+    c.executemany("UPDATE applications SET idempotency_key=? WHERE id=?", updates)
+
+def _ensure_triggers(c: sqlite3.Connection) -> None:
+    """
+    Mirror the latest task of each application onto its row, so listing
+    applications reads one table instead of four subqueries per row. Every
+    writer (API, worker, reaper, legacy shims) goes through these. Recreated
+    on every init so an older trigger body never survives a schema change.
+    """
+    c.execute("DROP TRIGGER IF EXISTS trg_tasks_latest_insert")
+    c.execute("DROP TRIGGER IF EXISTS trg_tasks_latest_update")
+    c.execute("""
+        CREATE TRIGGER trg_tasks_latest_insert AFTER INSERT ON tasks BEGIN
+            UPDATE applications
+            SET latest_task_id=NEW.id, status=NEW.status, attempts=NEW.attempts, error=NEW.error,
+                artifacts_json=NEW.artifacts_json, task_updated_at=NEW.updated_at
+            WHERE id=NEW.application_id AND (latest_task_id IS NULL OR latest_task_id <= NEW.id);
+        END;
+    """)
+    c.execute("""
+        CREATE TRIGGER trg_tasks_latest_update
+        AFTER UPDATE OF status, attempts, error, artifacts_json, updated_at ON tasks BEGIN
+            UPDATE applications
+            SET status=NEW.status, attempts=NEW.attempts, error=NEW.error,
+                artifacts_json=NEW.artifacts_json, task_updated_at=NEW.updated_at
+            WHERE id=NEW.application_id AND latest_task_id=NEW.id;
+        END;
+    """)
+
+def _backfill_latest(c: sqlite3.Connection) -> None:
+    """
+    Fill the mirrored columns for applications created before the triggers (or
+    task_updated_at) existed. Earlier triggers copied the task time into
+    updated_at, which nothing else writes after insert, so it is reset to
+    created_at for those rows.
+    """
+    c.execute("""
+        UPDATE applications
+        SET (latest_task_id, status, attempts, error, artifacts_json, task_updated_at) = (
+            SELECT t.id, t.status, t.attempts, t.error, t.artifacts_json, t.updated_at
+            FROM tasks t WHERE t.application_id=applications.id
+            ORDER BY t.id DESC LIMIT 1
+        ), updated_at=created_at
+        WHERE task_updated_at IS NULL AND EXISTS (SELECT 1 FROM tasks t WHERE t.application_id=applications.id)
+    """)
 
 # -------------------- Public API --------------------
 def init_apply() -> None:
     """Initialize/migrate DB schema."""
-    with _conn() as c:
+    with _tx() as c:
         _ensure_table_with_columns(c, "applications", REQUIRED_APP_COLUMNS)
         _ensure_table_with_columns(c, "tasks", REQUIRED_TASK_COLUMNS)
+        _backfill_keys(c)
         _ensure_indexes(c)
+        _ensure_triggers(c)
+        _backfill_latest(c)
 
-def enqueue_application(job: Dict[str, Any]) -> int:
-    """Create an application + initial QUEUED task. Returns new task_id."""
-    url = (job.get("url") or "").strip()
-    company = (job.get("company") or "").strip()
-    title = (job.get("title") or "").strip()
-    portal = (job.get("portal") or job.get("source") or "").strip().lower()
-    payload = json.dumps(job or {})
+def enqueue_many(jobs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Queue a batch of jobs in one transaction. Jobs whose idempotency key is
+    already queued (or repeated within the batch) are not inserted again.
+    Returns one {"application_id", "task_id", "duplicate"} per job, in order.
+    """
     now = _now()
-    with _conn() as c:
-        cur = c.execute(
-            "INSERT INTO applications(url, company, title, portal, job_json, created_at, updated_at) "
-            "VALUES (?,?,?,?,?,?,?)",
-            (url, company, title, portal, payload, now, now)
-        )
-        app_id = int(cur.lastrowid)
-        c.execute(
-            "INSERT INTO tasks(application_id, status, attempts, created_at, updated_at) "
-            "VALUES (?,?,?,?,?)",
-            (app_id, "QUEUED", 0, now, now)
-        )
-        task_id = c.execute(
-            "SELECT id FROM tasks WHERE application_id=? ORDER BY id DESC LIMIT 1",
-            (app_id,)
-        ).fetchone()[0]
-        return int(task_id)
-
-def list_applications() -> List[Dict[str, Any]]:
-    """Return latest status row per application, including last artifacts."""
-    with _conn() as c:
-        rows = c.execute("""
-            SELECT
-                a.id, a.url, a.company, a.title, a.portal, a.job_json, a.created_at, a.updated_at,
-                COALESCE((
-                    SELECT status FROM tasks
-                    WHERE application_id=a.id
-                    ORDER BY id DESC LIMIT 1
-                ), 'QUEUED') AS latest_status,
-                COALESCE((
-                    SELECT attempts FROM tasks
-                    WHERE application_id=a.id
-                    ORDER BY id DESC LIMIT 1
-                ), 0) AS attempts,
-                (
-                    SELECT error FROM tasks
-                    WHERE application_id=a.id
-                    ORDER BY id DESC LIMIT 1
-                ) AS error,
-                COALESCE((
-                    SELECT artifacts_json FROM tasks
-                    WHERE application_id=a.id
-                    ORDER BY id DESC LIMIT 1
-                ), '{}') AS artifacts_json
-            FROM applications a
-            ORDER BY a.id DESC
-        """).fetchall()
+    keys: List[str] = []
+    rows: Dict[str, Tuple[Any, ...]] = {}
+    for job in jobs:
+        job = job or {}
+        key = idempotency_key(job)
+        keys.append(key)
+        if key not in rows:
+            rows[key] = (
+                key,
+                (job.get("url") or "").strip(),
+                (job.get("company") or "").strip(),
+                (job.get("title") or "").strip(),
+                (job.get("portal") or job.get("source") or "").strip().lower(),
+                json.dumps(job),
+                now, now,
+            )
+    unique = list(rows)
+    ids: Dict[str, Tuple[int, Optional[int]]] = {}
+    with _tx() as c:
+        def lookup(batch: List[str]) -> None:
+            for i in range(0, len(batch), 500):
+                chunk = batch[i:i + 500]
+                for key, app_id, task_id in c.execute(
+                    "SELECT idempotency_key, id, latest_task_id FROM applications "
+                    f"WHERE idempotency_key IN ({','.join('?' * len(chunk))})", chunk
+                ):
+                    ids[key] = (int(app_id), task_id)
 
+        lookup(unique)
+        existing = set(ids)
+        fresh = [k for k in unique if k not in existing]
+        if fresh:
+            c.executemany(
+                "INSERT INTO applications(idempotency_key, url, company, title, portal, job_json, "
+                "created_at, updated_at) VALUES (?,?,?,?,?,?,?,?)",
+                [rows[k] for k in fresh]
+            )
+            lookup(fresh)
+        # new applications, plus old ones that never got a task
+        taskless = [k for k in unique if ids[k][1] is None]
+        if taskless:
+            # the tasks insert trigger stores each new task id on its application row
+            c.executemany(
+                "INSERT INTO tasks(application_id, status, attempts, created_at, updated_at) "
+                "VALUES (?, 'QUEUED', 0, ?, ?)",
+                [(ids[k][0], now, now) for k in taskless]
+            )
+            lookup(taskless)
     out: List[Dict[str, Any]] = []
-    for (app_id, url, company, title, portal, job_json, created_at, updated_at,
-         status, attempts, error, artifacts_json) in rows:
-        try:
-            job = json.loads(job_json or "{}")
-        except Exception:
-            job = {}
-        try:
-            artifacts = json.loads(artifacts_json or "{}")
-        except Exception:
-            artifacts = {}
-        out.append({
-            "id": app_id,
-            "url": url,
-            "company": company,
-            "title": title,
-            "portal": portal,
-            "job": job,
-            "status": status or "QUEUED",
-            "attempts": attempts or 0,
-            "error": error,
-            "artifacts": artifacts or None,
-            "created_at": created_at,
-            "updated_at": updated_at,
-        })
+    first = set()
+    for key in keys:
+        app_id, task_id = ids[key]
+        out.append({"application_id": app_id, "task_id": task_id,
+                    "duplicate": key in existing or key in first})
+        first.add(key)
     return out
 
+def enqueue_application(job: Dict[str, Any]) -> int:
+    """Queue one job (or find it already queued); returns its latest task id."""
+    return int(enqueue_many([job])[0]["task_id"])
+
+def _loads(raw: Optional[str]) -> Dict[str, Any]:
+    try:
+        return json.loads(raw or "{}")
+    except Exception:
+        return {}
+
+def applications_page(*, limit: Optional[int] = None, before_id: Optional[int] = None,
+                      statuses: Optional[List[str]] = None, portal: Optional[str] = None,
+                      company: Optional[str] = None, include_job: bool = True,
+                      include_artifacts: bool = True) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+    """
+    Applications newest first with their latest task state, and the id to pass
+    as `before_id` for the next page (None on the last page). Filters:
+    `statuses` (any of), `portal`, `company` (case-insensitive).
+    include_job / include_artifacts=False skip decoding those JSON blobs.
+    """
+    cols = ["id", "url", "company", "title", "portal", "status", "attempts", "error",
+            "created_at", "updated_at", "task_updated_at"]
+    if include_job:
+        cols.append("job_json")
+    if include_artifacts:
+        cols.append("artifacts_json")
+    where: List[str] = []
+    args: List[Any] = []
+    if before_id is not None:
+        where.append("id < ?")
+        args.append(before_id)
+    if statuses:
+        where.append(f"status IN ({','.join('?' * len(statuses))})")
+        args.extend(statuses)
+    if portal:
+        where.append("portal = ?")
+        args.append(portal.strip().lower())
+    if company:
+        where.append("company = ? COLLATE NOCASE")
+        args.append(company.strip())
+    sql = f"SELECT {', '.join(cols)} FROM applications"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += " ORDER BY id DESC"
+    if limit:
+        sql += " LIMIT ?"
+        args.append(limit + 1)   # one extra row tells us whether there is a next page
+    rows = _conn().execute(sql, args).fetchall()
+
+    next_id: Optional[int] = None
+    if limit and len(rows) > limit:
+        rows = rows[:limit]
+        next_id = int(rows[-1][0])
+    out: List[Dict[str, Any]] = []
+    for row in rows:
+        r = dict(zip(cols, row))
+        item = {
+            "id": r["id"],
+            "url": r["url"],
+            "company": r["company"],
+            "title": r["title"],
+            "portal": r["portal"],
+            "status": r["status"] or "QUEUED",
+            "attempts": r["attempts"] or 0,
+            "error": r["error"],
+            "created_at": r["created_at"],
+            "updated_at": r["updated_at"],
+            "task_updated_at": r["task_updated_at"],
+        }
+        if include_job:
+            item["job"] = _loads(r["job_json"])
+        if include_artifacts:
+            item["artifacts"] = _loads(r["artifacts_json"]) or None
+        out.append(item)
+    return out, next_id
+
+def list_applications(**filters: Any) -> List[Dict[str, Any]]:
+    """Return latest status row per application, including last artifacts (see applications_page)."""
+    return applications_page(**filters)[0]
+
 def get_application(app_id: int) -> Optional[Dict[str, Any]]:
     with _conn() as c:
         row = c.execute(
@@ -193,28 +450,48 @@ def get_application(app_id: int) -> Optional[Dict[str, Any]]:
         "updated_at": updated_at,
     }
 
-def update_task_status(task_id: int, status: str, *, error: Optional[str] = None) -> None:
+def update_task_status(task_id: int, status: str, *, error: Optional[str] = None,
+                       owner: Optional[str] = None) -> bool:
+    """
+    Set a task's status (leaving IN_PROGRESS ends its lease). With `owner`,
+    only applies while that worker still holds the task, so a worker whose
+    lease was reaped cannot overwrite the new claimant's state.
+    Returns whether the task was updated.
+    """
     if status not in VALID_STATUSES:
         raise ValueError(f"Invalid status: {status}")
-    now = _now()
-    with _conn() as c:
-        if error is None:
-            c.execute(
-                "UPDATE tasks SET status=?, updated_at=? WHERE id=?",
-                (status, now, task_id)
-            )
-        else:
-            c.execute(
-                "UPDATE tasks SET status=?, error=?, updated_at=? WHERE id=?",
-                (status, error, now, task_id)
-            )
+    sets = ["status=?", "updated_at=?"]
+    args: List[Any] = [status, _now()]
+    if error is not None:
+        sets.append("error=?")
+        args.append(error)
+    if status != "IN_PROGRESS":
+        sets.append("lease_expires_at=NULL")
+    where = "id=?"
+    args.append(task_id)
+    if owner is not None:
+        where += " AND lease_owner=?"
+        args.append(owner)
+    with _tx() as c:
+        cur = c.execute(f"UPDATE tasks SET {', '.join(sets)} WHERE {where}", args)
+    return cur.rowcount > 0
 
-def set_artifacts(task_id: int, data: Dict[str, Any]) -> None:
-    """Merge new artifacts into artifacts_json for a task."""
-    with _conn() as c:
-        prev = c.execute("SELECT artifacts_json FROM tasks WHERE id=?", (task_id,)).fetchone()
+def set_artifacts(task_id: int, data: Dict[str, Any], *, owner: Optional[str] = None) -> bool:
+    """
+    Merge new artifacts into artifacts_json for a task. With `owner`, only
+    while that worker still holds the task IN_PROGRESS (as update_task_status).
+    Returns whether the task was updated.
+    """
+    where, args = "id=?", [task_id]
+    if owner is not None:
+        where += " AND lease_owner=? AND status='IN_PROGRESS'"
+        args.append(owner)
+    with _tx() as c:
+        prev = c.execute(f"SELECT artifacts_json FROM tasks WHERE {where}", args).fetchone()
+        if not prev:
+            return False
         cur = {}
-        if prev and prev[0]:
+        if prev[0]:
             try:
                 cur = json.loads(prev[0])
             except Exception:
@@ -224,27 +501,28 @@ def set_artifacts(task_id: int, data: Dict[str, Any]) -> None:
             "UPDATE tasks SET artifacts_json=?, updated_at=? WHERE id=?",
             (json.dumps(cur), _now(), task_id)
         )
+    return True
 
-def increment_attempts(task_id: int) -> None:
-    with _conn() as c:
-        c.execute(
-            "UPDATE tasks SET attempts=attempts+1, updated_at=? WHERE id=?",
-            (_now(), task_id)
-        )
-
-def get_next_task() -> Optional[Dict[str, Any]]:
-    """Atomically fetch the next QUEUED task and mark it IN_PROGRESS."""
-    with _conn() as c:
+def get_next_task(worker_id: Optional[str] = None, lease_sec: Optional[float] = None) -> Optional[Dict[str, Any]]:
+    """
+    Claim the oldest QUEUED task for `worker_id`: one guarded UPDATE ... RETURNING
+    marks it IN_PROGRESS, counts the attempt and starts a lease, so two workers
+    can never claim the same task.
+    """
+    owner = worker_id or WORKER_ID
+    expires = time.time() + (lease_sec or LEASE_SEC)
+    with _tx() as c:
         row = c.execute(
-            "SELECT id, application_id FROM tasks WHERE status='QUEUED' ORDER BY id ASC LIMIT 1"
+            "UPDATE tasks SET status='IN_PROGRESS', attempts=attempts+1, lease_owner=?, "
+            "lease_expires_at=?, updated_at=? "
+            "WHERE id=(SELECT id FROM tasks WHERE status='QUEUED' ORDER BY id ASC LIMIT 1) "
+            "AND status='QUEUED' "
+            "RETURNING id, application_id, attempts",
+            (owner, expires, _now())
         ).fetchone()
         if not row:
             return None
-        task_id, app_id = int(row[0]), int(row[1])
-        c.execute(
-            "UPDATE tasks SET status='IN_PROGRESS', updated_at=? WHERE id=?",
-            (_now(), task_id)
-        )
+        task_id, app_id, attempts = int(row[0]), int(row[1]), int(row[2])
         a = c.execute(
             "SELECT url, company, title, portal, job_json FROM applications WHERE id=?",
             (app_id,)
@@ -260,6 +538,9 @@ def get_next_task() -> Optional[Dict[str, Any]]:
         "task_id": task_id,
         "application_id": app_id,
         "status": "IN_PROGRESS",
+        "attempts": attempts,
+        "lease_owner": owner,
+        "lease_expires_at": expires,
         "url": url,
         "company": company,
         "title": title,
@@ -267,14 +548,47 @@ def get_next_task() -> Optional[Dict[str, Any]]:
         "job": job,
     }
 
+def heartbeat(task_id: int, worker_id: Optional[str] = None, lease_sec: Optional[float] = None) -> bool:
+    """Extend the lease on a task this worker holds; False means the lease was lost (reaped or reclaimed)."""
+    with _tx() as c:
+        cur = c.execute(
+            "UPDATE tasks SET lease_expires_at=? WHERE id=? AND lease_owner=? AND status='IN_PROGRESS'",
+            (time.time() + (lease_sec or LEASE_SEC), task_id, worker_id or WORKER_ID)
+        )
+    return cur.rowcount > 0
+
+def reap_expired(max_attempts: Optional[int] = None) -> Dict[str, List[int]]:
+    """
+    Recover tasks whose worker stopped heartbeating: re-queue them, or fail
+    them once they have used up their attempts. IN_PROGRESS rows with no
+    lease (claimed before leases existed) count as expired.
+    """
+    limit = max_attempts or MAX_ATTEMPTS
+    now = time.time()
+    expired = "status='IN_PROGRESS' AND (lease_expires_at IS NULL OR lease_expires_at < ?)"
+    with _tx() as c:
+        failed = [r[0] for r in c.execute(
+            f"UPDATE tasks SET status='FAILED', error='lease expired', lease_owner=NULL, "
+            f"lease_expires_at=NULL, updated_at=? WHERE {expired} AND attempts >= ? RETURNING id",
+            (_now(), now, limit)
+        ).fetchall()]
+        requeued = [r[0] for r in c.execute(
+            f"UPDATE tasks SET status='QUEUED', error='lease expired', lease_owner=NULL, "
+            f"lease_expires_at=NULL, updated_at=? WHERE {expired} RETURNING id",
+            (_now(), now)
+        ).fetchall()]
+    if failed or requeued:
+        print(f"[apply_db] reaped expired leases: requeued={requeued} failed={failed}")
+    return {"requeued": requeued, "failed": failed}
+
 # -------------------- Legacy shims (backward compat) --------------------
 def transition(task_id: int, new_status: str, error: Optional[str] = None) -> None:
     """Compatibility: old worker imports `transition`."""
     update_task_status(task_id, new_status, error=error)
 
-def dequeue_next():
+def dequeue_next(worker_id: Optional[str] = None, lease_sec: Optional[float] = None):
     """Compatibility: old worker name."""
-    return get_next_task()
+    return get_next_task(worker_id, lease_sec)
 
 def update_application_status(task_id: int, status: str, *, error: Optional[str] = None) -> None:
     """Compatibility: old worker name."""
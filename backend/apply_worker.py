@@ -1,5 +1,6 @@
-import asyncio, os, traceback
-from apply_db import init_apply, dequeue_next, increment_attempts, update_task_status, set_artifacts
+import asyncio, os, time, traceback
+from apply_db import (init_apply, dequeue_next, heartbeat, reap_expired, update_task_status, set_artifacts,
+                      LEASE_SEC, MAX_ATTEMPTS, WORKER_ID)
 from tailor import tailor
 
 FAKE = os.getenv("AUTO_APPLY_FAKE", "0") == "1"
@@ -13,7 +14,9 @@ PROFILE = {
 }
 
 SLEEP_IDLE_SEC = 3
-MAX_RETRIES = 2
+MAX_RETRIES = MAX_ATTEMPTS
+HEARTBEAT_SEC = max(1.0, LEASE_SEC / 3)   # several beats per lease, so one slow write does not lose it
+REAP_INTERVAL_SEC = float(os.getenv("APPLY_REAP_INTERVAL_SEC", "30"))
 
 async def submit_real(job, files, profile):
     from playwright.async_api import async_playwright
@@ -21,26 +24,28 @@ async def submit_real(job, files, profile):
     async with async_playwright() as pw_ctx:
         return await submit_for_job(pw_ctx, job, files, profile)
 
-async def process_one():
-    item = dequeue_next()
-    if not item:
-        await asyncio.sleep(SLEEP_IDLE_SEC)
-        return
+class LeaseLost(Exception):
+    pass
 
-    task_id, job = item["task_id"], item["job"]
-    print(f"[worker] picked task={task_id} portal={item.get('portal')} title={item.get('title')} url={item.get('url')}")
+async def keep_leased(task_id):
+    """Extend the task's lease until cancelled; returns once the lease is lost."""
+    while True:
+        await asyncio.sleep(HEARTBEAT_SEC)
+        if not heartbeat(task_id, WORKER_ID):
+            return
 
+async def run_task(item):
+    task_id, job = item["task_id"], item["job"]
     try:
-        increment_attempts(task_id)
-        update_task_status(task_id, "IN_PROGRESS")
-
-        # 1) Tailor
-        tailored = tailor(job, PROFILE)
+        # 1) Tailor (off the event loop so heartbeats keep going)
+        tailored = await asyncio.to_thread(tailor, job, PROFILE)
         files = {}
         if tailored.get("resume_docx_path"): files["resume"] = tailored["resume_docx_path"]
         if tailored.get("cover_letter_path"): files["cover_letter"] = tailored["cover_letter_path"]
 
-        # 2) Submit
+        # 2) Submit, only while we still hold the task (the reaper may have handed it on)
+        if not heartbeat(task_id, WORKER_ID):
+            raise LeaseLost()
         if FAKE:
             print("[worker] FAKE mode: skipping real submission, marking SUBMITTED")
             result = {"portal": job.get("portal") or job.get("source"), "submitted": True, "fake": True}
@@ -48,29 +53,55 @@ async def process_one():
             result = await submit_real(job, files, PROFILE)
 
         # 3) Save artifacts + status
-        set_artifacts(task_id, {"tailored": tailored, "submission": result})
+        if not set_artifacts(task_id, {"tailored": tailored, "submission": result}, owner=WORKER_ID):
+            raise LeaseLost()
         if result.get("submitted"):
-            update_task_status(task_id, "SUBMITTED")
-            update_task_status(task_id, "DONE")
+            update_task_status(task_id, "SUBMITTED", owner=WORKER_ID)
+            update_task_status(task_id, "DONE", owner=WORKER_ID)
         else:
-            update_task_status(task_id, "FAILED", error="Submission did not confirm")
+            update_task_status(task_id, "FAILED", error="Submission did not confirm", owner=WORKER_ID)
 
+    except LeaseLost:
+        print(f"[worker] lost lease on task={task_id}; dropping it")
     except Exception as e:
         tb = traceback.format_exc()
         print(f"[worker] ERROR task={task_id}: {e}\n{tb}")
-        # read attempts, then decide retry or fail
-        from apply_db import _conn
-        with _conn() as c:
-            attempts = c.execute("SELECT attempts FROM tasks WHERE id=?", (task_id,)).fetchone()[0]
-        if attempts >= MAX_RETRIES:
-            update_task_status(task_id, "FAILED", error=str(e))
+        # attempts were counted when the task was claimed
+        if item["attempts"] >= MAX_RETRIES:
+            update_task_status(task_id, "FAILED", error=str(e), owner=WORKER_ID)
         else:
-            update_task_status(task_id, "QUEUED", error=str(e))
+            update_task_status(task_id, "QUEUED", error=str(e), owner=WORKER_ID)
+
+async def process_one():
+    item = dequeue_next(WORKER_ID)
+    if not item:
+        await asyncio.sleep(SLEEP_IDLE_SEC)
+        return
+
+    task_id = item["task_id"]
+    print(f"[worker] picked task={task_id} attempt={item['attempts']} portal={item.get('portal')} "
+          f"title={item.get('title')} url={item.get('url')}")
+    work = asyncio.create_task(run_task(item))
+    beats = asyncio.create_task(keep_leased(task_id))
+    await asyncio.wait({work, beats}, return_when=asyncio.FIRST_COMPLETED)
+    if not work.done():
+        # lease lost mid-run: someone else owns the task now, so stop before we submit twice
+        print(f"[worker] lost lease on task={task_id}; cancelling")
+        work.cancel()
+        try:
+            await work
+        except asyncio.CancelledError:
+            pass
+    beats.cancel()
 
 async def main():
     init_apply()
-    print(f"[worker] started with APPLY_DB_PATH={os.getenv('APPLY_DB_PATH')}, FAKE={FAKE}")
+    print(f"[worker] started id={WORKER_ID} with APPLY_DB_PATH={os.getenv('APPLY_DB_PATH')}, FAKE={FAKE}")
+    next_reap = 0.0
     while True:
+        if time.monotonic() >= next_reap:
+            reap_expired(MAX_RETRIES)   # tasks of workers that died mid-run
+            next_reap = time.monotonic() + REAP_INTERVAL_SEC
         await process_one()
 
 if __name__ == "__main__":
@@ -5,26 +5,36 @@ from pathlib import Path
 from typing import Dict, Any, Optional
 from playwright.async_api import async_playwright, Page, Browser
 
+from host_scheduler import async_slot
+
 DATA_DIR = Path("data")
 DATA_DIR.mkdir(parents=True, exist_ok=True)
 
 def _now(): return datetime.utcnow().isoformat()+"Z"
 
+async def _goto(page: Page, slot, url: str, timeout: int):
+    """page.goto that reports throttling (429/503) to the host scheduler."""
+    resp = await page.goto(url, wait_until="domcontentloaded", timeout=timeout)
+    if resp is not None and resp.status in (429, 503):
+        slot.outcome = "throttled"
+    return resp
+
 async def run_draft(pw, job: Dict[str,Any]) -> Dict[str,Any]:
     """Your existing draft: open page, take screenshot + DOM."""
     browser = await pw.chromium.launch(headless=True)
     ctx = await browser.new_context()
     page = await ctx.new_page()
-    await page.goto(job["url"], wait_until="domcontentloaded", timeout=60000)
+    async with async_slot(job["url"]) as slot:
+        await _goto(page, slot, job["url"], 60000)
 
-    appid = job.get("id") or f"{int(datetime.utcnow().timestamp())}"
-    out_dir = DATA_DIR / "drafts" / str(appid)
-    out_dir.mkdir(parents=True, exist_ok=True)
+        appid = job.get("id") or f"{int(datetime.utcnow().timestamp())}"
+        out_dir = DATA_DIR / "drafts" / str(appid)
+        out_dir.mkdir(parents=True, exist_ok=True)
 
-    shot = out_dir / "screenshot.png"
-    dom  = out_dir / "dom.html"
-    await page.screenshot(path=str(shot), full_page=True)
-    await Path(dom).write_text(await page.content(), encoding="utf-8")
+        shot = out_dir / "screenshot.png"
+        dom  = out_dir / "dom.html"
+        await page.screenshot(path=str(shot), full_page=True)
+        await Path(dom).write_text(await page.content(), encoding="utf-8")
 
     await ctx.close(); await browser.close()
     return {
@@ -136,23 +146,25 @@ async def submit_for_job(pw, job: Dict[str,Any], files: Dict[str,str], profile:
     browser = await pw.chromium.launch(headless=True)
     ctx = await browser.new_context()
     page = await ctx.new_page()
-    await page.goto(job["url"], wait_until="domcontentloaded", timeout=90000)
-
-    # choose submitter
-    portal = (job.get("portal") or job.get("source") or "").lower()
-    if not portal:
-        url = job.get("url","").lower()
-        portal = "greenhouse" if "greenhouse.io" in url else "lever" if "lever.co" in url else "other"
-
-    result = {"portal": portal, "submitted": False}
-
-    if portal == "greenhouse":
-        result = await submit_greenhouse(page, job, files, profile)
-    elif portal == "lever":
-        result = await submit_lever(page, job, files, profile)
-    else:
-        # fallback: just take a screenshot as artifact
-        pass
+    # one portal session per slot: the host scheduler paces page loads per portal
+    async with async_slot(job["url"]) as slot:
+        await _goto(page, slot, job["url"], 90000)
+
+        # choose submitter
+        portal = (job.get("portal") or job.get("source") or "").lower()
+        if not portal:
+            url = job.get("url","").lower()
+            portal = "greenhouse" if "greenhouse.io" in url else "lever" if "lever.co" in url else "other"
+
+        result = {"portal": portal, "submitted": False}
+
+        if portal == "greenhouse":
+            result = await submit_greenhouse(page, job, files, profile)
+        elif portal == "lever":
+            result = await submit_lever(page, job, files, profile)
+        else:
+            # fallback: just take a screenshot as artifact
+            pass
 
     # save artifacts
     appid = job.get("id") or f"{int(datetime.utcnow().timestamp())}"
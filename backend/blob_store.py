@@ -0,0 +1,71 @@
+# backend/blob_store.py
+from __future__ import annotations
+import os
+import zlib
+import hashlib
+import time
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional, Set
+
+# Content-addressed store for large texts (full job descriptions).
+# A blob lives at <BLOB_DIR>/<ref[:2]>/<ref>.z, where ref = sha256(text); the
+# same JD fetched from several boards or on every poll is stored once.
+BLOB_DIR = Path(os.getenv("JD_BLOB_DIR", "data/jd_blobs"))
+ZLIB_LEVEL = 6
+# an unreferenced blob is kept this long after it was last stored, so refs
+# held only by search results or queued applications survive a sweep
+BLOB_GRACE_SEC = float(os.getenv("JD_BLOB_GRACE_SEC", str(7 * 86400)))
+
+def _path(ref: str) -> Path:
+    return BLOB_DIR / ref[:2] / f"{ref}.z"
+
+def text_ref(text: str) -> str:
+    return hashlib.sha256((text or "").encode("utf-8")).hexdigest()
+
+def put_text(text: str) -> str:
+    """Store `text` (if not already present) and return its ref."""
+    ref = text_ref(text)
+    path = _path(ref)
+    try:
+        os.utime(path)  # already stored: mark it as recently seen for sweep()
+    except FileNotFoundError:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{threading.get_ident()}.tmp")
+        tmp.write_bytes(zlib.compress((text or "").encode("utf-8"), ZLIB_LEVEL))
+        os.replace(tmp, path)
+    return ref
+
+@lru_cache(maxsize=256)
+def _load(ref: str) -> str:
+    return zlib.decompress(_path(ref).read_bytes()).decode("utf-8")
+
+def get_text(ref: Optional[str]) -> Optional[str]:
+    """Full text for `ref`, or None if unknown. Recently used blobs stay in memory."""
+    if not ref or len(ref) != 64 or not all(c in "0123456789abcdef" for c in ref):
+        return None
+    if not _path(ref).exists():
+        return None  # checked first so a miss is never cached
+    return _load(ref)
+
+def sweep(referenced: Set[str], grace_sec: float = BLOB_GRACE_SEC) -> int:
+    """
+    Delete blobs whose ref is not in `referenced` and that were last stored
+    more than `grace_sec` ago. Returns the number of blobs removed.
+    """
+    if not BLOB_DIR.exists():
+        return 0
+    cutoff = time.time() - grace_sec
+    removed = 0
+    for path in BLOB_DIR.glob("??/*.z"):
+        if path.stem in referenced:
+            continue
+        try:
+            if path.stat().st_mtime >= cutoff:
+                continue
+            path.unlink()
+        except FileNotFoundError:
+            continue
+        removed += 1
+    return removed
@@ -0,0 +1,149 @@
+# backend/connectors/cache.py
+from __future__ import annotations
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+from connectors.http_client import get as http_get
+
+log = logging.getLogger(__name__)
+
+# -------------------- Config --------------------
+CACHE_DIR = Path(os.getenv("BOARD_CACHE_DIR", "data/board_cache"))
+CACHE_TTL_SEC = float(os.getenv("BOARD_CACHE_TTL_SEC", "900"))          # fresh: served as-is
+CACHE_STALE_SEC = float(os.getenv("BOARD_CACHE_STALE_SEC", "86400"))    # then stale-while-revalidate
+CACHE_ENABLED = os.getenv("BOARD_CACHE", "1") != "0"
+
+_lock = threading.Lock()
+_inflight: set[str] = set()
+_stats: Dict[str, float] = {
+    "hits": 0,              # fresh entry, no network
+    "misses": 0,            # nothing on disk, blocking download
+    "stale_served": 0,      # stale entry returned, refresh kicked off in background
+    "revalidated": 0,       # conditional GET answered 304
+    "refreshed": 0,         # conditional GET answered 200 with a new body
+    "errors": 0,            # network errors during (re)validation, background refreshes included
+    "bytes_downloaded": 0,
+    "bytes_saved": 0,       # body bytes served from disk instead of the network
+    "fetch_ms_total": 0,    # time spent on network round-trips
+    "fetches": 0,
+}
+
+def _bump(**kw: float) -> None:
+    with _lock:
+        for k, v in kw.items():
+            _stats[k] += v
+
+def cache_stats() -> Dict[str, Any]:
+    """Counters plus a rough estimate of the network time the cache avoided."""
+    with _lock:
+        s = dict(_stats)
+    avg_ms = (s["fetch_ms_total"] / s["fetches"]) if s["fetches"] else 0.0
+    s["avg_fetch_ms"] = round(avg_ms, 1)
+    s["est_latency_saved_ms"] = round((s["hits"] + s["stale_served"]) * avg_ms, 1)
+    return s
+
+# -------------------- Disk entries --------------------
+def _paths(url: str) -> tuple[Path, Path]:
+    key = hashlib.sha1(url.encode("utf-8")).hexdigest()[:24]
+    return CACHE_DIR / f"{key}.body", CACHE_DIR / f"{key}.meta.json"
+
+def _read_meta(meta_path: Path) -> Optional[Dict[str, Any]]:
+    try:
+        return json.loads(meta_path.read_text(encoding="utf-8"))
+    except Exception:
+        return None
+
+def _write_meta(meta_path: Path, meta: Dict[str, Any]) -> None:
+    tmp = meta_path.with_suffix(f".{threading.get_ident()}.tmp")
+    tmp.write_text(json.dumps(meta), encoding="utf-8")
+    os.replace(tmp, meta_path)
+
+def _fetch(url: str, meta: Optional[Dict[str, Any]], timeout: float) -> Path:
+    """(Conditional) GET; stores a 200 body on disk, touches the entry on 304."""
+    body_path, meta_path = _paths(url)
+    headers: Dict[str, str] = {}
+    if meta and body_path.exists():
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+
+    t0 = time.monotonic()
+    try:
+        with http_get(url, headers=headers, timeout=timeout, budget=timeout, stream=True) as r:
+            if r.status_code == 304 and headers:
+                meta = dict(meta or {}, fetched_at=time.time())
+                _write_meta(meta_path, meta)
+                _bump(revalidated=1, bytes_saved=body_path.stat().st_size)
+                return body_path
+            r.raise_for_status()
+            CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            tmp = body_path.with_suffix(f".{threading.get_ident()}.part")
+            size = 0
+            with open(tmp, "wb") as f:
+                for chunk in r.iter_content(chunk_size=64 * 1024):
+                    f.write(chunk)
+                    size += len(chunk)
+            os.replace(tmp, body_path)
+            _write_meta(meta_path, {
+                "url": url,
+                "etag": r.headers.get("ETag"),
+                "last_modified": r.headers.get("Last-Modified"),
+                "fetched_at": time.time(),
+            })
+            _bump(bytes_downloaded=size, **({"refreshed": 1} if headers else {}))
+            return body_path
+    except Exception:
+        _bump(errors=1)
+        raise
+    finally:
+        _bump(fetch_ms_total=(time.monotonic() - t0) * 1000, fetches=1)
+
+def _refresh_in_background(url: str, meta: Dict[str, Any], timeout: float) -> None:
+    body_path, _ = _paths(url)
+    with _lock:
+        if body_path.name in _inflight:
+            return
+        _inflight.add(body_path.name)
+
+    def run():
+        try:
+            _fetch(url, meta, timeout)
+        except Exception as e:
+            # _fetch has already counted this in the errors stat
+            log.warning("background refresh failed for %s: %s", url, e)
+        finally:
+            with _lock:
+                _inflight.discard(body_path.name)
+
+    threading.Thread(target=run, name="board-cache-refresh", daemon=True).start()
+
+# -------------------- Public API --------------------
+def get_cached(url: str, *, timeout: float = 20, ttl: float = CACHE_TTL_SEC) -> Path:
+    """
+    Return the path of the on-disk body for `url`.
+    fresh -> served from disk; stale (within BOARD_CACHE_STALE_SEC) -> served from
+    disk while a background conditional GET refreshes it; older -> blocking
+    conditional GET; missing -> blocking download.
+    """
+    body_path, meta_path = _paths(url)
+    meta = _read_meta(meta_path) if CACHE_ENABLED else None
+    if not meta or not body_path.exists():
+        _bump(misses=1)
+        return _fetch(url, None, timeout)
+
+    age = time.time() - float(meta.get("fetched_at") or 0)
+    if age < ttl:
+        _bump(hits=1, bytes_saved=body_path.stat().st_size)
+        return body_path
+    if age < ttl + CACHE_STALE_SEC:
+        _bump(stale_served=1, bytes_saved=body_path.stat().st_size)
+        _refresh_in_background(url, meta, timeout)
+        return body_path
+    return _fetch(url, meta, timeout)
@@ -0,0 +1,111 @@
+# backend/connectors/fanout.py
+from __future__ import annotations
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
+from typing import List, Dict, Any, Iterator, Tuple, Callable
+
+from connectors.greenhouse import fetch_greenhouse_jobs
+from connectors.lever import fetch_lever_jobs
+from connectors.http_client import BoardFetchError
+
+# -------------------- Config --------------------
+SEARCH_DEADLINE_SEC = float(os.getenv("SEARCH_DEADLINE_SEC", "25"))   # whole request
+BOARD_TIMEOUT_SEC = float(os.getenv("BOARD_TIMEOUT_SEC", "10"))       # single board
+FANOUT_MAX_WORKERS = int(os.getenv("FANOUT_MAX_WORKERS", "16"))
+
+# Shared pool: a board that overruns the deadline keeps its thread until its own
+# HTTP timeout fires, but never blocks the search request that spawned it.
+_POOL = ThreadPoolExecutor(max_workers=FANOUT_MAX_WORKERS, thread_name_prefix="board")
+
+Fetcher = Callable[..., List[Dict[str, Any]]]
+
+def _run_board(fetch: Fetcher, state: Dict[str, Any], roles: List[str], locations: List[str], timeout: float):
+    state["started"] = time.monotonic()
+    return fetch(state["board"], roles, locations, timeout=timeout)
+
+def _status(state: Dict[str, Any], status: str, count: int = 0, error: str | None = None,
+            **extra: Any) -> Dict[str, Any]:
+    started = state.get("started") or state["queued"]
+    return {
+        "source": state["source"],
+        "board": state["board"],
+        "status": status,            # ok | error | rate_limited | timeout
+        "count": count,
+        "elapsed_ms": int((time.monotonic() - started) * 1000),
+        "error": error,
+        **extra,
+    }
+
+def iter_boards(
+    gh_boards: List[str],
+    lever_companies: List[str],
+    roles: List[str],
+    locations: List[str],
+    *,
+    deadline_sec: float = SEARCH_DEADLINE_SEC,
+    board_timeout_sec: float = BOARD_TIMEOUT_SEC,
+) -> Iterator[Tuple[Dict[str, Any], List[Dict[str, Any]]]]:
+    """
+    Fetch every board concurrently and yield (status, jobs) as each one finishes.
+    Boards still running at their own timeout or at the global deadline are
+    yielded last with status 'timeout' and no jobs.
+    """
+    plan: List[Tuple[str, str, Fetcher]] = (
+        [("Greenhouse", b, fetch_greenhouse_jobs) for b in gh_boards]
+        + [("Lever", c, fetch_lever_jobs) for c in lever_companies]
+    )
+    now = time.monotonic()
+    deadline = now + deadline_sec
+    pending: Dict[Future, Dict[str, Any]] = {}
+    for source, board, fetch in plan:
+        state = {"source": source, "board": board, "queued": now, "started": None}
+        fut = _POOL.submit(_run_board, fetch, state, roles, locations, board_timeout_sec)
+        pending[fut] = state
+
+    while pending:
+        now = time.monotonic()
+        # boards that started but overran their own budget
+        for fut, state in list(pending.items()):
+            if state["started"] and now - state["started"] > board_timeout_sec:
+                del pending[fut]
+                yield _status(state, "timeout", error=f"board exceeded {board_timeout_sec:g}s"), []
+        if not pending:
+            break
+        if now >= deadline:
+            for fut, state in pending.items():
+                fut.cancel()  # no-op if already running
+                yield _status(state, "timeout", error=f"search deadline {deadline_sec:g}s reached"), []
+            return
+
+        expiries = [s["started"] + board_timeout_sec for s in pending.values() if s["started"]]
+        wake = min([deadline] + expiries)
+        done, _ = wait(list(pending), timeout=max(0.0, wake - now) + 0.01, return_when=FIRST_COMPLETED)
+        for fut in done:
+            state = pending.pop(fut)
+            try:
+                jobs = fut.result()
+            except BoardFetchError as e:
+                status = "rate_limited" if e.kind == "rate_limited" else "error"
+                yield _status(state, status, error=str(e), http_status=e.status,
+                              retry_after=e.retry_after, attempts=e.attempts), []
+                continue
+            except Exception as e:
+                yield _status(state, "error", error=f"{type(e).__name__}: {e}"), []
+                continue
+            yield _status(state, "ok", count=len(jobs)), jobs
+
+def fetch_boards(
+    gh_boards: List[str],
+    lever_companies: List[str],
+    roles: List[str],
+    locations: List[str],
+    **kwargs: Any,
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Collect iter_boards() into (jobs, per-board status summary)."""
+    jobs: List[Dict[str, Any]] = []
+    summary: List[Dict[str, Any]] = []
+    for status, batch in iter_boards(gh_boards, lever_companies, roles, locations, **kwargs):
+        summary.append(status)
+        jobs.extend(batch)
+    return jobs, summary
@@ -1,41 +1,61 @@
 
-import requests
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Optional
 from datetime import datetime
+from html import unescape
 
-API = "https://boards-api.greenhouse.io/v1/boards/{token}/jobs"
+from connectors.cache import get_cached
+from connectors.jsonstream import iter_array
+from blob_store import put_text
+from locations import location_filter, location_ids, LocationFilter
+
+JD_PREVIEW_CHARS = 800  # inline preview; the full text lives in the blob store
+
+API = "https://boards-api.greenhouse.io/v1/boards/{token}/jobs?content=true"
 
 def _strip_html(html: str) -> str:
     import re
     text = re.sub(r"<[^>]+>", " ", html or "")
     text = re.sub(r"\s+", " ", text).strip()
-    return text[:800]
+    return text
 
-def fetch_greenhouse_jobs(board_token: str, roles: List[str], locations: List[str]) -> List[Dict[str, Any]]:
+def iter_greenhouse_jobs(board_token: str, roles: List[str], locations: List[str], timeout: float = 20) -> Iterator[Dict[str, Any]]:
+    """
+    Stream a board's postings: the cached body is parsed one job at a time, so
+    only the current job (not the whole board) is held in memory.
+    """
     url = API.format(token=board_token)
-    r = requests.get(url, timeout=20)
-    r.raise_for_status()
-    data = r.json().get("jobs", [])
-    out = []
-    for j in data:
-        title = j.get("title","")
-        offices = [o.get("name","") for o in j.get("offices",[])]
-        loc_ok = True if not locations else any(any(loc.lower() in off.lower() for off in offices) for loc in locations)
-        role_ok = True if not roles else any(rk.lower() in title.lower() for rk in roles)
-        if not (loc_ok and role_ok):
-            continue
-        gh_url = j.get("absolute_url") or j.get("url") or ""
-        jd = j.get("content","") or ""
-        created = j.get("updated_at") or j.get("created_at") or datetime.utcnow().isoformat()
-        location = offices[0] if offices else (j.get("location",{}) or {}).get("name","")
-        out.append({
-            "id": f"gh-{board_token}-{j.get('id')}",
-            "title": title,
-            "company": board_token,
-            "location": location or "—",
-            "source": "Greenhouse",
-            "url": gh_url,
-            "jd_text": _strip_html(jd),
-            "created_at": created,
-        })
-    return out
+    where = location_filter(locations)
+    with get_cached(url, timeout=timeout).open("r", encoding="utf-8") as fp:
+        for j in iter_array(fp, "jobs"):
+            posting = _normalize(board_token, j, roles, where)
+            if posting:
+                yield posting
+
+def fetch_greenhouse_jobs(board_token: str, roles: List[str], locations: List[str], timeout: float = 20) -> List[Dict[str, Any]]:
+    return list(iter_greenhouse_jobs(board_token, roles, locations, timeout=timeout))
+
+def _normalize(board_token: str, j: Dict[str, Any], roles: List[str], where: LocationFilter) -> Optional[Dict[str, Any]]:
+    title = j.get("title","")
+    role_ok = True if not roles else any(rk.lower() in title.lower() for rk in roles)
+    if not role_ok:
+        return None
+    offices = [o.get("name","") for o in j.get("offices",[])]
+    loc_ids = location_ids(offices + [(j.get("location",{}) or {}).get("name","")])
+    if where and not where.matches_offices(offices, loc_ids):
+        return None
+    gh_url = j.get("absolute_url") or j.get("url") or ""
+    jd = _strip_html(unescape(j.get("content","") or ""))  # content=true returns entity-escaped HTML
+    created = j.get("updated_at") or j.get("created_at") or datetime.utcnow().isoformat()
+    location = offices[0] if offices else (j.get("location",{}) or {}).get("name","")
+    return {
+        "id": f"gh-{board_token}-{j.get('id')}",
+        "title": title,
+        "company": board_token,
+        "location": location or "—",
+        "location_ids": loc_ids,
+        "source": "Greenhouse",
+        "url": gh_url,
+        "jd_text": jd[:JD_PREVIEW_CHARS],
+        "jd_ref": put_text(jd),
+        "created_at": created,
+    }
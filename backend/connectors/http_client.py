@@ -0,0 +1,155 @@
+# backend/connectors/http_client.py
+from __future__ import annotations
+import os
+import time
+import random
+import weakref
+import threading
+from contextlib import ExitStack
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from host_scheduler import slot as host_slot, HostBusy
+
+# -------------------- Config --------------------
+HTTP_POOL_HOSTS = int(os.getenv("HTTP_POOL_HOSTS", "16"))       # hosts with a kept-alive pool
+HTTP_POOL_PER_HOST = int(os.getenv("HTTP_POOL_PER_HOST", "8"))  # connections per host
+HTTP_RETRIES = int(os.getenv("HTTP_RETRIES", "3"))              # retries after the first attempt
+BACKOFF_BASE_SEC = float(os.getenv("HTTP_BACKOFF_BASE_SEC", "0.5"))
+BACKOFF_MAX_SEC = float(os.getenv("HTTP_BACKOFF_MAX_SEC", "20"))
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+USER_AGENT = "agentic-job-assistant/0.5"
+
+class BoardFetchError(Exception):
+    """
+    A board request that could not be completed, after retries.
+    kind: rate_limited | server_error | http_error | network
+    """
+
+    def __init__(self, url: str, kind: str, status: Optional[int] = None,
+                 retry_after: Optional[float] = None, attempts: int = 1, message: str = ""):
+        super().__init__(message or f"{kind} ({status}) for {url}")
+        self.url = url
+        self.kind = kind
+        self.status = status
+        self.retry_after = retry_after
+        self.attempts = attempts
+
+# -------------------- Shared session --------------------
+_session_lock = threading.Lock()
+_session: Optional[requests.Session] = None
+
+def session() -> requests.Session:
+    """Process-wide keep-alive session; retries are handled in get(), not by urllib3."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            s = requests.Session()
+            # pool_block: a request waits for a free connection instead of opening
+            # (and then discarding) one past HTTP_POOL_PER_HOST; host_scheduler's
+            # slots keep per-host concurrency near that cap, so the wait is short
+            adapter = HTTPAdapter(pool_connections=HTTP_POOL_HOSTS, pool_maxsize=HTTP_POOL_PER_HOST,
+                                  pool_block=True, max_retries=0)
+            s.mount("https://", adapter)
+            s.mount("http://", adapter)
+            s.headers.update({"User-Agent": USER_AGENT, "Accept": "application/json"})
+            _session = s
+        return _session
+
+def _retry_after(r: requests.Response) -> Optional[float]:
+    """Retry-After as seconds (delta-seconds or HTTP-date form)."""
+    raw = (r.headers.get("Retry-After") or "").strip()
+    if not raw:
+        return None
+    try:
+        return max(0.0, float(raw))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(raw)
+        return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+    except Exception:
+        return None
+
+def _backoff(attempt: int) -> float:
+    """Full-jitter exponential backoff."""
+    return random.uniform(0, min(BACKOFF_MAX_SEC, BACKOFF_BASE_SEC * (2 ** (attempt - 1))))
+
+def _hold_slot(r: requests.Response, held: ExitStack) -> None:
+    """
+    Keep a streamed response's host slot until its body is done: the slot is
+    released once iter_content() (and so .content/.json()) is exhausted, or on
+    r.close() / leaving `with r:`, whichever comes first.
+    """
+    iter_content, close = r.iter_content, r.close
+
+    def iter_and_release(*args, **kwargs):
+        try:
+            yield from iter_content(*args, **kwargs)
+        finally:
+            held.close()
+
+    def close_and_release():
+        try:
+            close()
+        finally:
+            held.close()
+
+    r.iter_content, r.close = iter_and_release, close_and_release
+    weakref.finalize(r, held.close)  # a response dropped without close() still frees the slot
+
+def get(url: str, *, headers: Optional[Dict[str, str]] = None, timeout: float = 20,
+        budget: Optional[float] = None, stream: bool = False) -> requests.Response:
+    """
+    GET through the pooled session, retrying 429/5xx and network errors with
+    jittered exponential backoff (Retry-After wins when the server sends it).
+    `budget` caps the total time including waits, and every attempt goes
+    through the per-host scheduler (host_scheduler.slot). Returns the response for
+    2xx/3xx; raises BoardFetchError otherwise. With stream=True the slot stays
+    held until the body has been read or the response is closed.
+    """
+    deadline = time.monotonic() + budget if budget else None
+    attempt = 0
+    while True:
+        attempt += 1
+        max_wait = None if deadline is None else max(0.0, deadline - time.monotonic() - 0.1)
+        try:
+            with ExitStack() as stack:
+                s = stack.enter_context(host_slot(url, max_wait=max_wait))
+                per_try = timeout if deadline is None else max(0.1, min(timeout, deadline - time.monotonic()))
+                try:
+                    r = session().get(url, headers=headers, timeout=per_try, stream=stream)
+                except requests.Timeout:
+                    s.outcome = "timeout"
+                    raise
+                if r.status_code in (429, 503):
+                    s.outcome, s.retry_after = "throttled", _retry_after(r)
+                elif r.status_code >= 500:
+                    s.outcome = "error"
+                if stream and r.status_code < 400:
+                    _hold_slot(r, stack.pop_all())
+        except HostBusy as e:
+            raise BoardFetchError(url, "rate_limited", attempts=attempt, message=str(e))
+        except (requests.ConnectionError, requests.Timeout) as e:
+            err = BoardFetchError(url, "network", attempts=attempt, message=f"{type(e).__name__}: {e}")
+            wait = _backoff(attempt)
+        else:
+            if r.status_code < 400:
+                return r
+            r.close()
+            if r.status_code not in RETRY_STATUSES:
+                raise BoardFetchError(url, "http_error", r.status_code, attempts=attempt)
+            ra = _retry_after(r)
+            kind = "rate_limited" if r.status_code == 429 else "server_error"
+            err = BoardFetchError(url, kind, r.status_code, retry_after=ra, attempts=attempt)
+            wait = ra if ra is not None else _backoff(attempt)
+
+        if attempt > HTTP_RETRIES or wait > BACKOFF_MAX_SEC:
+            raise err
+        if deadline is not None and time.monotonic() + wait >= deadline:
+            raise err
+        time.sleep(wait)
@@ -0,0 +1,108 @@
+# backend/connectors/jsonstream.py
+from __future__ import annotations
+import json
+from typing import Any, Iterator, Optional, TextIO
+
+CHUNK_CHARS = 64 * 1024
+_WS = " \t\r\n"
+_NUMBER = "0123456789.eE+-"
+_decoder = json.JSONDecoder()
+
+class _Reader:
+    """Sliding text buffer over a file; only the unparsed tail is kept in memory."""
+
+    def __init__(self, fp: TextIO):
+        self.fp = fp
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self) -> bool:
+        if self.eof:
+            return False
+        chunk = self.fp.read(CHUNK_CHARS)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Next non-whitespace char ('' at EOF), without consuming it."""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _WS:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self.fill():
+                return ""
+
+    def expect(self, ch: str) -> None:
+        got = self.peek()
+        if got != ch:
+            raise ValueError(f"expected {ch!r} in JSON stream, got {got!r}")
+        self.pos += 1
+
+    def value(self) -> Any:
+        """Decode one complete JSON value, reading more input until it fits."""
+        self.peek()
+        while True:
+            try:
+                val, end = _decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if not self.fill():
+                    raise
+                continue
+            # a number is only complete once a non-number char follows it
+            if (isinstance(val, (int, float)) and not isinstance(val, bool)
+                    and self._number_may_continue(end) and self.fill()):
+                continue
+            self.pos = end
+            return val
+
+    def _number_may_continue(self, end: int) -> bool:
+        tail = self.buf[end:]
+        return not self.eof and all(c in _NUMBER for c in tail)
+
+def _iter_array(r: _Reader) -> Iterator[Any]:
+    r.expect("[")
+    if r.peek() == "]":
+        r.pos += 1
+        return
+    while True:
+        yield r.value()
+        nxt = r.peek()
+        r.pos += 1
+        if nxt == "]":
+            return
+        if nxt != ",":
+            raise ValueError(f"expected ',' or ']' in JSON array, got {nxt!r}")
+
+def iter_array(fp: TextIO, key: Optional[str] = None) -> Iterator[Any]:
+    """
+    Yield the elements of a JSON array one at a time: the top-level array, or
+    with `key`, the array under that key of a top-level object (other members
+    are skipped). Memory is bounded by the largest single element, not the
+    document.
+    """
+    r = _Reader(fp)
+    if key is None:
+        yield from _iter_array(r)
+        return
+    r.expect("{")
+    if r.peek() == "}":
+        return
+    while True:
+        name = r.value()
+        r.expect(":")
+        if name == key and r.peek() == "[":
+            yield from _iter_array(r)
+            return
+        r.value()  # skip this member
+        nxt = r.peek()
+        r.pos += 1
+        if nxt == "}":
+            return
+        if nxt != ",":
+            raise ValueError(f"expected ',' or '}}' in JSON object, got {nxt!r}")
@@ -1,33 +1,55 @@
 
-import requests
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Optional
 from datetime import datetime
 
+from connectors.cache import get_cached
+from connectors.jsonstream import iter_array
+from blob_store import put_text
+from locations import location_filter, location_ids, LocationFilter
+
+JD_PREVIEW_CHARS = 800  # inline preview; the full text lives in the blob store
+
 URL = "https://api.lever.co/v0/postings/{company}?mode=json"
 
-def fetch_lever_jobs(company: str, roles: List[str], locations: List[str]) -> List[Dict[str, Any]]:
+def iter_lever_jobs(company: str, roles: List[str], locations: List[str], timeout: float = 20) -> Iterator[Dict[str, Any]]:
+    """Stream a company's postings one at a time from the cached response body."""
     url = URL.format(company=company)
-    r = requests.get(url, timeout=20)
-    if r.status_code != 200:
-        return []
-    data = r.json()
-    out = []
-    for j in data:
-        title = j.get("text","")
-        loc = j.get("categories",{}).get("location","") or ""
-        role_ok = True if not roles else any(k.lower() in title.lower() for k in roles)
-        loc_ok = True if not locations else any(k.lower() in loc.lower() for k in locations)
-        if not (role_ok and loc_ok):
-            continue
-        jd = j.get("descriptionPlain","") or j.get("description","") or ""
-        out.append({
-            "id": f"lever-{company}-{j.get('id')}",
-            "title": title,
-            "company": company,
-            "location": loc or "—",
-            "source": "Lever",
-            "url": j.get("hostedUrl") or j.get("applyUrl") or "",
-            "jd_text": jd[:800],
-            "created_at": j.get("createdAt") or datetime.utcnow().isoformat(),
-        })
-    return out
+    where = location_filter(locations)
+    with get_cached(url, timeout=timeout).open("r", encoding="utf-8") as fp:
+        for j in iter_array(fp):
+            posting = _normalize(company, j, roles, where)
+            if posting:
+                yield posting
+
+def fetch_lever_jobs(company: str, roles: List[str], locations: List[str], timeout: float = 20) -> List[Dict[str, Any]]:
+    return list(iter_lever_jobs(company, roles, locations, timeout=timeout))
+
+def _created_at(value: Any) -> str:
+    """Lever's createdAt is epoch milliseconds; everything downstream expects ISO-8601."""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return datetime.utcfromtimestamp(value / 1000).isoformat()
+    return value or datetime.utcnow().isoformat()
+
+def _normalize(company: str, j: Dict[str, Any], roles: List[str], where: LocationFilter) -> Optional[Dict[str, Any]]:
+    title = j.get("text","")
+    role_ok = True if not roles else any(k.lower() in title.lower() for k in roles)
+    if not role_ok:
+        return None
+    loc = j.get("categories",{}).get("location","") or ""
+    offices = [loc] + list(j.get("categories",{}).get("allLocations") or [])
+    loc_ids = location_ids(offices)
+    if where and not where.matches_offices(offices, loc_ids):
+        return None
+    jd = j.get("descriptionPlain","") or j.get("description","") or ""
+    return {
+        "id": f"lever-{company}-{j.get('id')}",
+        "title": title,
+        "company": company,
+        "location": loc or "—",
+        "location_ids": loc_ids,
+        "source": "Lever",
+        "url": j.get("hostedUrl") or j.get("applyUrl") or "",
+        "jd_text": jd[:JD_PREVIEW_CHARS],
+        "jd_ref": put_text(jd),
+        "created_at": _created_at(j.get("createdAt")),
+    }
@@ -0,0 +1,134 @@
+# backend/dedupe.py
+from __future__ import annotations
+import os
+import re
+import threading
+import zlib
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+NUM_PERM = 64
+BANDS = 16                    # 16 bands x 4 rows: pairs above ~0.5 Jaccard usually share a bucket
+NEAR_DUP_THRESHOLD = float(os.getenv("NEAR_DUP_THRESHOLD", "0.7"))  # estimated Jaccard to merge
+MAX_BUCKET_CHECKS = 64        # boilerplate-heavy buckets: compare against the first N members only
+
+_PRIME = np.uint64((1 << 31) - 1)
+_rng = np.random.default_rng(20240817)   # fixed seed: signatures are comparable across processes
+_A = _rng.integers(1, int(_PRIME), size=NUM_PERM, dtype=np.uint64)
+_B = _rng.integers(0, int(_PRIME), size=NUM_PERM, dtype=np.uint64)
+
+_ABBREV = {
+    "sr": "senior", "snr": "senior", "jr": "junior", "eng": "engineer", "engr": "engineer",
+    "mgr": "manager", "dev": "developer", "swe": "software engineer", "ii": "2", "iii": "3",
+    "&": "and",
+}
+_WORDS = re.compile(r"[a-z0-9\+#&]+")
+
+def normalize_title(title: str) -> str:
+    """'Sr. Backend Eng II' -> 'senior backend engineer 2'."""
+    return " ".join(_ABBREV.get(w, w) for w in _WORDS.findall((title or "").lower()))
+
+def _company_key(company: str) -> str:
+    return re.sub(r"[^a-z0-9]", "", (company or "").lower())
+
+def shingles(title: str, jd: str) -> Set[str]:
+    """Title unigrams + bigrams and jd word 3-grams."""
+    t = normalize_title(title).split()
+    out = {f"t:{w}" for w in t} | {f"t:{a} {b}" for a, b in zip(t, t[1:])}
+    words = _WORDS.findall((jd or "").lower())
+    out |= {" ".join(words[i:i + 3]) for i in range(max(0, len(words) - 2))}
+    return out
+
+def minhash(sh: Set[str]) -> Optional[np.ndarray]:
+    """NUM_PERM-wide MinHash signature, or None when there is nothing to hash."""
+    if not sh:
+        return None
+    h = np.fromiter((zlib.crc32(s.encode("utf-8")) for s in sh), dtype=np.uint64, count=len(sh))
+    return ((_A[:, None] * h[None, :] + _B[:, None]) % _PRIME).min(axis=1)
+
+def similarity(a: np.ndarray, b: np.ndarray) -> float:
+    """Estimated Jaccard similarity of two signatures."""
+    return float(np.count_nonzero(a == b)) / NUM_PERM
+
+class NearDupIndex:
+    """
+    MinHash + LSH banding over postings, with union-find clusters.
+    Adding a posting only compares it against postings that share a band
+    bucket, so building over n postings is roughly linear. The first posting
+    added to a cluster stays its root.
+    """
+
+    def __init__(self, threshold: float = NEAR_DUP_THRESHOLD):
+        self.threshold = threshold
+        self.rows = NUM_PERM // BANDS
+        self._sigs: Dict[str, np.ndarray] = {}
+        self._company: Dict[str, str] = {}
+        self._buckets: Dict[Tuple[int, bytes], List[str]] = defaultdict(list)
+        self._parent: Dict[str, str] = {}
+
+    def find(self, pid: str) -> str:
+        parent = self._parent
+        root = parent.setdefault(pid, pid)
+        while parent[root] != root:
+            root = parent[root]
+        while parent[pid] != root:     # path compression
+            parent[pid], pid = root, parent[pid]
+        return root
+
+    def add(self, pid: str, title: str, jd: str, company: str = "") -> str:
+        """Index one posting; returns the root (canonical id) of its cluster."""
+        root = self.find(pid)
+        sig = minhash(shingles(title, jd))
+        if sig is None or pid in self._sigs:
+            return root
+        self._sigs[pid] = sig
+        self._company[pid] = ck = _company_key(company)
+        checked: Set[str] = set()
+        for band in range(BANDS):
+            key = (band, sig[band * self.rows:(band + 1) * self.rows].tobytes())
+            bucket = self._buckets[key]
+            for other in bucket[:MAX_BUCKET_CHECKS]:
+                if other in checked:
+                    continue
+                checked.add(other)
+                if self._company[other] == ck and similarity(sig, self._sigs[other]) >= self.threshold:
+                    a, b = self.find(pid), self.find(other)
+                    if a != b:
+                        self._parent[a] = b    # older cluster keeps its root
+            bucket.append(pid)
+        return self.find(pid)
+
+    def add_all(self, docs: Sequence[Dict[str, Any]]) -> "NearDupIndex":
+        for d in docs:
+            self.add(str(d.get("id")), d.get("title") or "", d.get("jd_text") or "", d.get("company") or "")
+        return self
+
+def collapse(items: List[Any], cluster_of: Callable[[str], str]) -> List[Tuple[Any, List[Any]]]:
+    """
+    Group already-ranked items by near-dup cluster. The first (best) item of
+    each cluster is kept; the rest become its alternates, in rank order.
+    """
+    groups: Dict[str, Tuple[Any, List[Any]]] = {}
+    order: List[str] = []
+    for it in items:
+        root = cluster_of(str(it.id))
+        if root in groups:
+            groups[root][1].append(it)
+        else:
+            groups[root] = (it, [])
+            order.append(root)
+    return [groups[r] for r in order]
+
+# -------------------- Corpus index (job_index) --------------------
+_lock = threading.Lock()
+_cached: Dict[str, Any] = {"version": None, "index": None}
+
+def corpus_dupes(version: Any, load_docs) -> NearDupIndex:
+    """Near-dup clusters over the stored postings, rebuilt only when `version` changes."""
+    with _lock:
+        if _cached["index"] is None or _cached["version"] != version:
+            _cached["index"] = NearDupIndex().add_all(load_docs())
+            _cached["version"] = version
+        return _cached["index"]
@@ -0,0 +1,97 @@
+# backend/docx_writer.py
+from __future__ import annotations
+import io
+import os
+import re
+import threading
+import zipfile
+from pathlib import Path
+from typing import Iterable, Optional, Tuple
+from xml.sax.saxutils import escape
+
+# Minimal DOCX renderer for the tailored resume / cover letter.
+# python-docx builds the styled base package once (Normal = Calibri 11pt);
+# its parts stay compressed in memory, and each document only renders
+# word/document.xml from strings and appends it to a copy of that zip.
+# The output is the same WordprocessingML python-docx would produce for
+# these plain paragraphs, so ATS parsers see no difference.
+
+DOC_PART = "word/document.xml"
+FONT_NAME = "Calibri"
+FONT_SIZE_PT = 11
+
+_lock = threading.Lock()
+_base: Optional[Tuple[bytes, str, str]] = None   # (zip without document.xml, xml head, sectPr tail)
+
+_INVALID_XML = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
+_ALIGN = {"center": "center", "right": "right", "left": "left", "justify": "both"}
+
+def _build_base() -> Tuple[bytes, str, str]:
+    from docx import Document
+    from docx.shared import Pt
+
+    doc = Document()
+    style = doc.styles["Normal"]
+    style.font.name = FONT_NAME
+    style.font.size = Pt(FONT_SIZE_PT)
+    raw = io.BytesIO()
+    doc.save(raw)
+
+    out = io.BytesIO()
+    with zipfile.ZipFile(raw) as src, zipfile.ZipFile(out, "w", zipfile.ZIP_DEFLATED) as dst:
+        for info in src.infolist():
+            if info.filename == DOC_PART:
+                xml = src.read(info).decode("utf-8")
+            else:
+                dst.writestr(info, src.read(info), compress_type=zipfile.ZIP_DEFLATED)
+    body = xml.index("<w:body>") + len("<w:body>")
+    sect = xml.index("<w:sectPr", body)
+    return out.getvalue(), xml[:body], xml[sect:]
+
+def _parts() -> Tuple[bytes, str, str]:
+    global _base
+    with _lock:
+        if _base is None:
+            _base = _build_base()
+        return _base
+
+def _run_text(text: str) -> str:
+    """<w:t>/<w:tab/>/<w:br/> sequence for text, as python-docx renders tabs and newlines."""
+    out = []
+    for i, line in enumerate(_INVALID_XML.sub("", text).split("\n")):
+        if i:
+            out.append("<w:br/>")
+        for j, chunk in enumerate(line.split("\t")):
+            if j:
+                out.append("<w:tab/>")
+            if chunk:
+                space = ' xml:space="preserve"' if chunk != chunk.strip() else ""
+                out.append(f"<w:t{space}>{escape(chunk)}</w:t>")
+    return "".join(out)
+
+def paragraph(text: str = "", *, bold: bool = False, size_pt: Optional[float] = None,
+              align: Optional[str] = None) -> str:
+    """One <w:p> with a single run; an empty text gives an empty paragraph (spacer)."""
+    ppr = f'<w:pPr><w:jc w:val="{_ALIGN[align]}"/></w:pPr>' if align else ""
+    if not text:
+        return f"<w:p>{ppr}</w:p>" if ppr else "<w:p/>"
+    rpr = ("<w:b/>" if bold else "") + (f'<w:sz w:val="{int(round(size_pt * 2))}"/>' if size_pt else "")
+    rpr = f"<w:rPr>{rpr}</w:rPr>" if rpr else ""
+    return f"<w:p>{ppr}<w:r>{rpr}{_run_text(text)}</w:r></w:p>"
+
+def render(paragraphs: Iterable[str]) -> bytes:
+    """The .docx bytes for a body made of paragraph() strings."""
+    base, head, tail = _parts()
+    buf = io.BytesIO(base)
+    buf.seek(0, io.SEEK_END)
+    with zipfile.ZipFile(buf, "a", zipfile.ZIP_DEFLATED) as z:
+        z.writestr(DOC_PART, head + "".join(paragraphs) + tail)
+    return buf.getvalue()
+
+def write_docx(path: Path, paragraphs: Iterable[str]) -> None:
+    """Render and write atomically (a reader never sees a half-written file)."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp.write_bytes(render(paragraphs))
+    os.replace(tmp, path)
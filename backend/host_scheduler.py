@@ -0,0 +1,221 @@
+# backend/host_scheduler.py
+from __future__ import annotations
+import os
+import time
+import asyncio
+import threading
+from contextlib import contextmanager, asynccontextmanager
+from typing import Dict, Any, Optional, Tuple
+from urllib.parse import urlsplit
+
+# Per-host politeness shared by the board connectors and the Playwright
+# submitters. Every request to a host takes one token from that host's bucket
+# (steady rate + burst) and one of its concurrency slots. The slot limit is
+# adaptive (AIMD): it grows by ~1 per limit's worth of successes and halves on
+# a 429 or timeout.
+
+# -------------------- Config --------------------
+HOST_RATE_PER_SEC = float(os.getenv("HOST_RATE_PER_SEC", "5"))       # bucket refill
+HOST_BURST = float(os.getenv("HOST_BURST", "10"))                     # bucket size
+HOST_MAX_CONCURRENCY = int(os.getenv("HOST_MAX_CONCURRENCY", "8"))
+HOST_MIN_CONCURRENCY = int(os.getenv("HOST_MIN_CONCURRENCY", "1"))
+BACKOFF_COOLDOWN_SEC = 1.0    # one multiplicative decrease per cooldown, however many requests fail
+POLL_SEC = 0.05               # wake-up interval while waiting on a free slot
+
+# host -> (rate/s, burst, max concurrency). Portal pages are full browser loads:
+# keep them slow. Override with HOST_LIMITS="host=rate:burst:max,...".
+_DEFAULT_LIMITS: Dict[str, Tuple[float, float, int]] = {
+    "boards-api.greenhouse.io": (5.0, 10.0, 8),
+    "api.lever.co": (5.0, 10.0, 8),
+    "boards.greenhouse.io": (0.5, 2.0, 2),
+    "job-boards.greenhouse.io": (0.5, 2.0, 2),
+    "jobs.lever.co": (0.5, 2.0, 2),
+}
+
+def _parse_limits(raw: str) -> Dict[str, Tuple[float, float, int]]:
+    out: Dict[str, Tuple[float, float, int]] = {}
+    for item in (raw or "").split(","):
+        host, _, spec = item.strip().partition("=")
+        parts = spec.split(":")
+        if not host or len(parts) != 3:
+            continue
+        try:
+            out[host.lower()] = (float(parts[0]), float(parts[1]), int(parts[2]))
+        except ValueError:
+            print(f"[host_scheduler] ignoring bad HOST_LIMITS entry: {item!r}")
+    return out
+
+HOST_LIMITS = {**_DEFAULT_LIMITS, **_parse_limits(os.getenv("HOST_LIMITS", ""))}
+
+def host_of(url_or_host: str) -> str:
+    if "://" not in url_or_host:
+        return url_or_host.lower()
+    return (urlsplit(url_or_host).hostname or "").lower()
+
+class HostLimiter:
+    """Token bucket + AIMD concurrency limit for one host. Not used directly: see slot()."""
+
+    def __init__(self, host: str, rate: float, burst: float, max_limit: int):
+        self.host = host
+        self.rate = rate
+        self.burst = burst
+        self.max_limit = max(HOST_MIN_CONCURRENCY, max_limit)
+        self.limit = float(self.max_limit)
+        self.tokens = burst
+        self.stamp = time.monotonic()
+        self.paused_until = 0.0
+        self.last_decrease = 0.0
+        self.in_flight = 0
+        self.cond = threading.Condition()
+        self.m: Dict[str, float] = {
+            "requests": 0, "waited": 0, "wait_ms_total": 0, "wait_ms_max": 0,
+            "ok": 0, "throttled": 0, "timeouts": 0, "errors": 0, "decreases": 0,
+        }
+
+    def try_acquire(self) -> Optional[float]:
+        """Take a token and a slot; None on success, else seconds until worth retrying. Call under cond."""
+        now = time.monotonic()
+        if now < self.paused_until:
+            return self.paused_until - now
+        self.tokens = min(self.burst, self.tokens + (now - self.stamp) * self.rate)
+        self.stamp = now
+        if self.in_flight >= int(self.limit):
+            return POLL_SEC
+        if self.tokens < 1.0:
+            return (1.0 - self.tokens) / self.rate if self.rate > 0 else POLL_SEC
+        self.tokens -= 1.0
+        self.in_flight += 1
+        return None
+
+    def admitted(self, waited: float) -> None:
+        m = self.m
+        m["requests"] += 1
+        if waited > 0.001:
+            ms = waited * 1000
+            m["waited"] += 1
+            m["wait_ms_total"] += ms
+            m["wait_ms_max"] = max(m["wait_ms_max"], ms)
+
+    def release(self, outcome: str, retry_after: Optional[float] = None) -> None:
+        """outcome: ok | throttled | timeout | error (errors leave the limit alone)."""
+        with self.cond:
+            self.in_flight -= 1
+            now = time.monotonic()
+            if outcome == "ok":
+                self.m["ok"] += 1
+                self.limit = min(float(self.max_limit), self.limit + 1.0 / self.limit)
+            elif outcome in ("throttled", "timeout"):
+                self.m["throttled" if outcome == "throttled" else "timeouts"] += 1
+                if now - self.last_decrease >= BACKOFF_COOLDOWN_SEC:
+                    self.limit = max(float(HOST_MIN_CONCURRENCY), self.limit / 2)
+                    self.last_decrease = now
+                    self.m["decreases"] += 1
+                if retry_after:
+                    self.paused_until = max(self.paused_until, now + retry_after)
+            else:
+                self.m["errors"] += 1
+            self.cond.notify_all()
+
+    def stats(self) -> Dict[str, Any]:
+        with self.cond:
+            m = dict(self.m)
+            m.update(host=self.host, limit=round(self.limit, 2), max_limit=self.max_limit,
+                     in_flight=self.in_flight, rate_per_sec=self.rate, burst=self.burst,
+                     tokens=round(self.tokens, 2),
+                     paused_sec=round(max(0.0, self.paused_until - time.monotonic()), 2))
+            m["wait_ms_total"] = round(m["wait_ms_total"], 1)
+            m["wait_ms_max"] = round(m["wait_ms_max"], 1)
+            m["avg_wait_ms"] = round(m["wait_ms_total"] / m["waited"], 1) if m["waited"] else 0.0
+            return m
+
+_lock = threading.Lock()
+_hosts: Dict[str, HostLimiter] = {}
+
+def limiter(url_or_host: str) -> HostLimiter:
+    host = host_of(url_or_host)
+    with _lock:
+        lim = _hosts.get(host)
+        if lim is None:
+            rate, burst, max_limit = HOST_LIMITS.get(host, (HOST_RATE_PER_SEC, HOST_BURST, HOST_MAX_CONCURRENCY))
+            lim = _hosts[host] = HostLimiter(host, rate, burst, max_limit)
+        return lim
+
+class HostBusy(Exception):
+    """No slot/token for the host within the caller's wait budget."""
+
+    def __init__(self, host: str, waited: float):
+        super().__init__(f"host {host} busy: no slot after {waited:.2f}s")
+        self.host = host
+        self.waited = waited
+
+class Slot:
+    """Handle for one admitted request; set `outcome` (and `retry_after`) before leaving the block."""
+
+    def __init__(self, lim: HostLimiter, waited: float):
+        self.host = lim.host
+        self.waited = waited
+        self.outcome = "ok"
+        self.retry_after: Optional[float] = None
+
+def _exit_outcome(s: Slot, exc: Optional[BaseException]) -> str:
+    if exc is None or s.outcome != "ok":
+        return s.outcome
+    return "timeout" if "timeout" in type(exc).__name__.lower() else "error"
+
+@contextmanager
+def slot(url_or_host: str, max_wait: Optional[float] = None):
+    """Blocking admission for threaded callers. Raises HostBusy past `max_wait` seconds."""
+    lim = limiter(url_or_host)
+    t0 = time.monotonic()
+    with lim.cond:
+        while True:
+            hint = lim.try_acquire()
+            if hint is None:
+                break
+            waited = time.monotonic() - t0
+            if max_wait is not None and waited + hint > max_wait:
+                raise HostBusy(lim.host, waited)
+            lim.cond.wait(hint)
+        s = Slot(lim, time.monotonic() - t0)
+        lim.admitted(s.waited)
+    try:
+        yield s
+    except BaseException as e:
+        lim.release(_exit_outcome(s, e), s.retry_after)
+        raise
+    lim.release(s.outcome, s.retry_after)
+
+@asynccontextmanager
+async def async_slot(url_or_host: str, max_wait: Optional[float] = None):
+    """slot() for asyncio callers (Playwright); waits with asyncio.sleep, never blocks the loop."""
+    lim = limiter(url_or_host)
+    t0 = time.monotonic()
+    while True:
+        with lim.cond:
+            hint = lim.try_acquire()
+            if hint is None:
+                s = Slot(lim, time.monotonic() - t0)
+                lim.admitted(s.waited)
+                break
+        waited = time.monotonic() - t0
+        if max_wait is not None and waited + hint > max_wait:
+            raise HostBusy(lim.host, waited)
+        await asyncio.sleep(min(hint, 1.0))
+    try:
+        yield s
+    except BaseException as e:
+        lim.release(_exit_outcome(s, e), s.retry_after)
+        raise
+    lim.release(s.outcome, s.retry_after)
+
+def host_stats() -> Dict[str, Any]:
+    """Per-host limiter state and wait metrics."""
+    with _lock:
+        lims = list(_hosts.values())
+    hosts = [l.stats() for l in lims]
+    return {
+        "hosts": sorted(hosts, key=lambda h: h["host"]),
+        "requests": sum(h["requests"] for h in hosts),
+        "waited": sum(h["waited"] for h in hosts),
+        "wait_ms_total": round(sum(h["wait_ms_total"] for h in hosts), 1),
+    }
@@ -0,0 +1,416 @@
+# backend/job_index.py
+from __future__ import annotations
+import os
+import re
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from collections import Counter
+from typing import Dict, Any, List, Iterator, Optional, Callable, Set
+
+from connectors.fanout import iter_boards
+from locations import location_filter, location_ids
+from keywords import doc_terms
+from blob_store import get_text, sweep as sweep_blobs
+
+# -------------------- Config & helpers --------------------
+INDEX_DB_PATH = os.getenv("JOB_INDEX_DB_PATH", "data/jobs_index.sqlite3")
+INDEX_REFRESH_SEC = float(os.getenv("JOB_INDEX_REFRESH_SEC", "900"))
+CHANGES_RETENTION = int(os.getenv("JOB_INDEX_CHANGES_RETENTION", "100000"))  # rows kept in the feed
+# ingest runs off the request path, so it gets far more time than a live search
+INGEST_DEADLINE_SEC = float(os.getenv("JOB_INDEX_INGEST_DEADLINE_SEC", "600"))      # whole pass
+INGEST_BOARD_TIMEOUT_SEC = float(os.getenv("JOB_INDEX_INGEST_BOARD_TIMEOUT_SEC", "120"))  # single board
+os.makedirs(os.path.dirname(INDEX_DB_PATH) or ".", exist_ok=True)
+
+log = logging.getLogger(__name__)
+
+# jd_text is the short preview; jd_ref points at the full description in blob_store
+POSTING_FIELDS = ("id", "title", "company", "location", "source", "url", "jd_text", "created_at", "jd_ref")
+
+# outcome of the most recent ingestion pass (per-board status like /search/status)
+LAST_INGEST: Dict[str, Any] = {"boards": [], "purged": {}, "blobs_swept": 0, "finished_at": None, "postings": 0}
+
+_SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS postings (
+        pk INTEGER PRIMARY KEY,
+        id TEXT NOT NULL UNIQUE,
+        board TEXT NOT NULL,
+        title TEXT, company TEXT, location TEXT, source TEXT, url TEXT,
+        jd_text TEXT, created_at TEXT,
+        jd_ref TEXT,
+        content_hash TEXT,
+        indexed_at TEXT NOT NULL
+    );
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_postings_board ON postings(board);",
+    # canonical location ids (locations.py, ancestors included) resolved at ingest
+    """
+    CREATE TABLE IF NOT EXISTS posting_locations (
+        pk INTEGER NOT NULL,
+        loc_id TEXT NOT NULL,
+        PRIMARY KEY (pk, loc_id)
+    ) WITHOUT ROWID;
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_posting_locations_loc ON posting_locations(loc_id);",
+    """
+    CREATE TRIGGER IF NOT EXISTS postings_locations_ad AFTER DELETE ON postings BEGIN
+        DELETE FROM posting_locations WHERE pk = old.pk;
+    END;
+    """,
+    # document frequency of JD keywords (keywords.doc_terms), for IDF
+    """
+    CREATE TABLE IF NOT EXISTS term_df (
+        term TEXT PRIMARY KEY,
+        df INTEGER NOT NULL
+    ) WITHOUT ROWID;
+    """,
+    # append-only delta feed; seq is the cursor handed to clients
+    """
+    CREATE TABLE IF NOT EXISTS posting_changes (
+        seq INTEGER PRIMARY KEY AUTOINCREMENT,
+        posting_id TEXT NOT NULL,
+        board TEXT NOT NULL,
+        op TEXT NOT NULL,
+        changed_at TEXT NOT NULL
+    );
+    """,
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS postings_fts USING fts5(
+        title, company, location, jd_text,
+        content='postings', content_rowid='pk', tokenize='unicode61'
+    );
+    """,
+    # keep the FTS table in step with postings (external-content pattern)
+    """
+    CREATE TRIGGER IF NOT EXISTS postings_ai AFTER INSERT ON postings BEGIN
+        INSERT INTO postings_fts(rowid, title, company, location, jd_text)
+        VALUES (new.pk, new.title, new.company, new.location, new.jd_text);
+    END;
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS postings_ad AFTER DELETE ON postings BEGIN
+        INSERT INTO postings_fts(postings_fts, rowid, title, company, location, jd_text)
+        VALUES ('delete', old.pk, old.title, old.company, old.location, old.jd_text);
+    END;
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS postings_au AFTER UPDATE ON postings BEGIN
+        INSERT INTO postings_fts(postings_fts, rowid, title, company, location, jd_text)
+        VALUES ('delete', old.pk, old.title, old.company, old.location, old.jd_text);
+        INSERT INTO postings_fts(rowid, title, company, location, jd_text)
+        VALUES (new.pk, new.title, new.company, new.location, new.jd_text);
+    END;
+    """,
+]
+
+def _now() -> str:
+    return datetime.utcnow().isoformat() + "Z"
+
+@contextmanager
+def _db() -> Iterator[sqlite3.Connection]:
+    """Short-lived connection; the body runs in one transaction."""
+    c = sqlite3.connect(INDEX_DB_PATH, timeout=10, check_same_thread=False)
+    try:
+        with c:
+            yield c
+    finally:
+        c.close()
+
+def board_key(source: str, board: str) -> str:
+    return f"{(source or '').lower()}:{board}"
+
+def _location_ids(posting: Dict[str, Any]) -> List[str]:
+    ids = posting.get("location_ids")
+    return sorted(ids) if ids is not None else location_ids([posting.get("location") or ""])
+
+def _jd_terms(pid: str, jd_ref: Optional[str], jd_text: Optional[str]) -> frozenset:
+    return doc_terms(get_text(jd_ref) or jd_text or "", pid)
+
+def _apply_df(c: sqlite3.Connection, delta: Counter) -> None:
+    c.executemany(
+        "INSERT INTO term_df(term, df) VALUES (?,?) ON CONFLICT(term) DO UPDATE SET df = df + excluded.df",
+        [(t, n) for t, n in delta.items() if n],
+    )
+    # only terms that were just decremented can have dropped to zero
+    dropped = [(t,) for t, n in delta.items() if n < 0]
+    if dropped:
+        c.executemany("DELETE FROM term_df WHERE term = ? AND df <= 0", dropped)
+
+def content_hash(posting: Dict[str, Any]) -> str:
+    """Fingerprint of the indexed fields; unchanged postings are never rewritten."""
+    raw = "\x1f".join(str(posting.get(f) or "") for f in POSTING_FIELDS)
+    raw += "\x1f" + " ".join(_location_ids(posting))  # a dictionary update re-resolves on next ingest
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+# -------------------- Schema --------------------
+def init_index() -> None:
+    """Create/migrate the index schema."""
+    with _db() as c:
+        c.execute("PRAGMA journal_mode=WAL;")
+        for stmt in _SCHEMA:
+            c.execute(stmt)
+        # migrate: indexes created before the delta feed existed
+        cols = {r[1] for r in c.execute("PRAGMA table_info(postings)").fetchall()}
+        for col in ("content_hash", "jd_ref"):
+            if col not in cols:
+                c.execute(f"ALTER TABLE postings ADD COLUMN {col} TEXT;")
+        # backfill location ids for postings indexed before they existed
+        rows = c.execute(
+            "SELECT pk, location FROM postings p "
+            "WHERE NOT EXISTS (SELECT 1 FROM posting_locations l WHERE l.pk = p.pk)"
+        ).fetchall()
+        c.executemany(
+            "INSERT OR IGNORE INTO posting_locations(pk, loc_id) VALUES (?,?)",
+            [(pk, lid) for pk, loc in rows for lid in location_ids([loc or ""])],
+        )
+        # backfill keyword document frequencies for an index built before term_df
+        if c.execute("SELECT 1 FROM term_df LIMIT 1").fetchone() is None:
+            df: Counter = Counter()
+            for pid, ref, text in c.execute("SELECT id, jd_ref, jd_text FROM postings"):
+                df.update(_jd_terms(pid, ref, text))
+            _apply_df(c, df)
+
+# -------------------- Ingestion --------------------
+def sync_board(source: str, board: str, postings: List[Dict[str, Any]]) -> Dict[str, int]:
+    """
+    Bring one board in the index up to date with `postings`, writing only the
+    rows whose fingerprint (id + content hash) changed, and log each insert/
+    update/remove to the posting_changes feed. Returns the delta counts.
+    """
+    key = board_key(source, board)
+    now = _now()
+    incoming: Dict[str, Dict[str, Any]] = {str(p["id"]): p for p in postings if p.get("id")}
+    delta = {"inserted": 0, "updated": 0, "removed": 0, "unchanged": 0}
+    with _db() as c:
+        rows = c.execute(
+            "SELECT id, content_hash, jd_ref, jd_text FROM postings WHERE board=?", (key,)
+        ).fetchall()
+        known = {r[0]: r[1] for r in rows}
+        old_jd = {r[0]: (r[2], r[3]) for r in rows}
+        df: Counter = Counter()
+        upserts, changes, located = [], [], []
+        for pid, p in incoming.items():
+            h = content_hash(p)
+            if known.get(pid) == h:
+                delta["unchanged"] += 1
+                continue
+            op = "update" if pid in known else "insert"
+            delta["inserted" if op == "insert" else "updated"] += 1
+            upserts.append(tuple(str(p.get(f) or "") for f in POSTING_FIELDS) + (key, h, now))
+            located.extend((lid, pid) for lid in _location_ids(p))
+            df.update(_jd_terms(pid, p.get("jd_ref"), p.get("jd_text")))
+            if op == "update":
+                df.subtract(_jd_terms(pid, *old_jd[pid]))
+            changes.append((pid, key, op, now))
+        gone = [pid for pid in known if pid not in incoming]
+        delta["removed"] = len(gone)
+        changes.extend((pid, key, "remove", now) for pid in gone)
+        for pid in gone:
+            df.subtract(_jd_terms(pid, *old_jd[pid]))
+
+        c.executemany(
+            "INSERT INTO postings(id, title, company, location, source, url, jd_text, created_at, jd_ref, board, content_hash, indexed_at) "
+            "VALUES (?,?,?,?,?,?,?,?,?,?,?,?) "
+            "ON CONFLICT(id) DO UPDATE SET title=excluded.title, company=excluded.company, "
+            "location=excluded.location, source=excluded.source, url=excluded.url, "
+            "jd_text=excluded.jd_text, created_at=excluded.created_at, jd_ref=excluded.jd_ref, board=excluded.board, "
+            "content_hash=excluded.content_hash, indexed_at=excluded.indexed_at",
+            upserts,
+        )
+        written = [(r[0],) for r in upserts]
+        c.executemany("DELETE FROM posting_locations WHERE pk = (SELECT pk FROM postings WHERE id=?)", written)
+        c.executemany("INSERT OR IGNORE INTO posting_locations(pk, loc_id) SELECT pk, ? FROM postings WHERE id=?", located)
+        c.executemany("DELETE FROM postings WHERE id=?", [(pid,) for pid in gone])
+        _apply_df(c, df)
+        c.executemany(
+            "INSERT INTO posting_changes(posting_id, board, op, changed_at) VALUES (?,?,?,?)",
+            changes,
+        )
+    return delta
+
+def _trim_changes() -> None:
+    with _db() as c:
+        c.execute(
+            "DELETE FROM posting_changes WHERE seq <= (SELECT MAX(seq) FROM posting_changes) - ?",
+            (CHANGES_RETENTION,),
+        )
+
+def purge_boards(keep: List[str]) -> Dict[str, int]:
+    """
+    Remove the postings of every indexed board whose key is not in `keep`
+    (boards dropped from the config), logging a remove for each to the
+    posting_changes feed. Returns {board key: postings removed}.
+    """
+    with _db() as c:
+        stale = [r[0] for r in c.execute("SELECT DISTINCT board FROM postings").fetchall()
+                 if r[0] not in set(keep)]
+    purged = {}
+    for key in stale:
+        source, _, board = key.partition(":")
+        purged[key] = sync_board(source, board, [])["removed"]   # an empty board: everything is "gone"
+    return purged
+
+def referenced_blobs() -> Set[str]:
+    """Every jd_ref still pointed at by an indexed posting."""
+    with _db() as c:
+        return {r[0] for r in c.execute("SELECT DISTINCT jd_ref FROM postings WHERE jd_ref IS NOT NULL")}
+
+def ingest_once(gh_boards: List[str], lever_companies: List[str]) -> Dict[str, Any]:
+    """Fetch every board unfiltered and sync its delta into the index."""
+    boards: List[Dict[str, Any]] = []
+    for status, jobs in iter_boards(gh_boards, lever_companies, [], [],
+                                    deadline_sec=INGEST_DEADLINE_SEC,
+                                    board_timeout_sec=INGEST_BOARD_TIMEOUT_SEC):
+        boards.append(status)
+        # a failed/timed-out board keeps its previous postings
+        if status["status"] == "ok":
+            status["delta"] = sync_board(status["source"], status["board"], jobs)
+        else:
+            log.warning("ingest kept %s:%s unchanged (%s): %s", status["source"], status["board"],
+                        status["status"], status.get("error"))
+    configured = ([board_key("Greenhouse", b) for b in gh_boards]
+                  + [board_key("Lever", c) for c in lever_companies])
+    purged = purge_boards(configured)
+    _trim_changes()
+    swept = sweep_blobs(referenced_blobs())
+    LAST_INGEST.update({"boards": boards, "purged": purged, "blobs_swept": swept,
+                        "finished_at": _now(), "postings": count_postings()})
+    return LAST_INGEST
+
+def start_ingest_loop(
+    gh_boards: List[str],
+    lever_companies: List[str],
+    interval: float = INDEX_REFRESH_SEC,
+    on_ingest: Optional[Callable[[], None]] = None,
+) -> threading.Thread:
+    """
+    Background thread re-ingesting all boards every `interval` seconds.
+    `on_ingest` runs after each pass (e.g. to rebuild derived indexes off the request path).
+    """
+    def run():
+        while True:
+            try:
+                ingest_once(gh_boards, lever_companies)
+                if on_ingest:
+                    on_ingest()
+            except Exception:
+                log.exception("ingest pass failed")
+            time.sleep(interval)
+
+    t = threading.Thread(target=run, name="job-index-ingest", daemon=True)
+    t.start()
+    return t
+
+# -------------------- Query --------------------
+def _fts_any(column: str, terms: List[str]) -> Optional[str]:
+    """column:("t1"* OR "t2"*) — prefix phrases so 'engineer' also hits 'engineering'."""
+    phrases = [
+        '"' + t.strip().replace('"', '""') + '"*'
+        for t in terms if t and re.search(r"\w", t)
+    ]
+    if not phrases:
+        return None
+    return f"{column} : (" + " OR ".join(phrases) + ")"
+
+def count_postings() -> int:
+    with _db() as c:
+        return int(c.execute("SELECT COUNT(*) FROM postings").fetchone()[0])
+
+def index_version() -> int:
+    """Bumps on every insert/update/remove; derived caches key on it."""
+    with _db() as c:
+        return int(c.execute("SELECT COALESCE(MAX(seq), 0) FROM posting_changes").fetchone()[0])
+
+def term_stats() -> tuple:
+    """(number of postings, {term: document frequency}) for IDF weighting."""
+    with _db() as c:
+        docs = int(c.execute("SELECT COUNT(*) FROM postings").fetchone()[0])
+        df = dict(c.execute("SELECT term, df FROM term_df").fetchall())
+    return docs, df
+
+def all_postings() -> List[Dict[str, Any]]:
+    cols = ", ".join(POSTING_FIELDS)
+    with _db() as c:
+        rows = c.execute(f"SELECT {cols} FROM postings ORDER BY pk").fetchall()
+    return [dict(zip(POSTING_FIELDS, r)) for r in rows]
+
+def index_ready() -> bool:
+    try:
+        return count_postings() > 0
+    except sqlite3.Error:
+        return False
+
+def search_index(roles: List[str], locations: List[str], limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Role filter on title via FTS5; location filter as a lookup of the
+    canonical ids resolved at ingest (terms the location dictionary does not
+    know fall back to an FTS5 match on the location text).
+    """
+    where, params = [], []
+    title_q = _fts_any("title", roles or [])
+    if title_q:
+        where.append("p.pk IN (SELECT rowid FROM postings_fts WHERE postings_fts MATCH ?)")
+        params.append(title_q)
+    flt = location_filter(locations)
+    if flt:
+        any_of = []
+        if flt.ids:
+            any_of.append(f"p.pk IN (SELECT pk FROM posting_locations WHERE loc_id IN ({','.join('?' for _ in flt.ids)}))")
+            params.extend(sorted(flt.ids))
+        loc_q = _fts_any("location", list(flt.unresolved))
+        if loc_q:
+            any_of.append("p.pk IN (SELECT rowid FROM postings_fts WHERE postings_fts MATCH ?)")
+            params.append(loc_q)
+        where.append("(" + " OR ".join(any_of or ["0"]) + ")")
+    cols = ", ".join(f"p.{f}" for f in POSTING_FIELDS)
+    sql = (f"SELECT {cols}, (SELECT group_concat(loc_id, ' ') FROM posting_locations l WHERE l.pk = p.pk) "
+           "FROM postings p")
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += " ORDER BY p.pk"
+    if limit:
+        sql += " LIMIT ?"
+        params.append(int(limit))
+    with _db() as c:
+        rows = c.execute(sql, params).fetchall()
+    out = []
+    for r in rows:
+        d = dict(zip(POSTING_FIELDS, r))
+        d["location_ids"] = (r[-1] or "").split()
+        out.append(d)
+    return out
+
+def changes_since(cursor: int = 0, limit: int = 100, ops: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    Delta feed after `cursor` (a posting_changes.seq). insert/update entries
+    carry the current posting; remove entries only carry the id.
+    Pass the returned next_cursor back to continue.
+    """
+    ops = ops or ["insert"]
+    marks = ",".join("?" for _ in ops)
+    cols = ", ".join(f"p.{f}" for f in POSTING_FIELDS)
+    with _db() as c:
+        # sqlite3 opens no transaction for SELECTs: BEGIN so head and the page
+        # are read from one snapshot, and bound the page by head anyway
+        c.execute("BEGIN")
+        head = c.execute("SELECT COALESCE(MAX(seq), 0) FROM posting_changes").fetchone()[0]
+        rows = c.execute(
+            f"SELECT ch.seq, ch.posting_id, ch.board, ch.op, ch.changed_at, {cols} "
+            "FROM posting_changes ch LEFT JOIN postings p ON p.id = ch.posting_id "
+            f"WHERE ch.seq > ? AND ch.seq <= ? AND ch.op IN ({marks}) ORDER BY ch.seq LIMIT ?",
+            [int(cursor), int(head), *ops, int(limit)],
+        ).fetchall()
+    out: List[Dict[str, Any]] = []
+    for seq, pid, board, op, changed_at, *fields in rows:
+        posting = dict(zip(POSTING_FIELDS, fields)) if op != "remove" and fields[0] else None
+        out.append({"seq": seq, "id": pid, "board": board, "op": op,
+                    "changed_at": changed_at, "posting": posting})
+    # a short page means everything up to head was scanned
+    has_more = len(out) == limit
+    next_cursor = out[-1]["seq"] if has_more else max(int(cursor), int(head))
+    return {"changes": out, "next_cursor": next_cursor, "has_more": has_more}
@@ -0,0 +1,143 @@
+# backend/keywords.py
+from __future__ import annotations
+import os
+import math
+import time
+import hashlib
+import itertools
+import threading
+from collections import Counter, OrderedDict
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+from ranking import tokenize
+
+# JD keyword extraction: tf x idf over the stored corpus, so terms every
+# posting uses ("team", "experience") sink and the specific ones
+# ("terraform", "kafka") rise. Document frequencies live in the job index
+# (term_df) and are updated as postings are ingested.
+
+KEYWORD_LIMIT = 200
+TERM_CACHE_SIZE = 2048
+MIN_LEN = 3
+
+STOPWORDS: FrozenSet[str] = frozenset("""
+a about above across after again against all also am an and any are as at be because been before being
+below between both but by can could did do does doing down during each either etc even ever every few for
+from further had has have having he her here hers him his how however i if in into is it its itself just
+least less like made make many may me might more most much must my no nor not now of off on once one only
+or other others our ours out over own per please rather same she should since so some such than that the
+their theirs them then there these they this those through thus to too under until up upon us very via was
+we well were what when where whether which while who whom whose why will with within without would yet you
+your yours yourself
+ability able across apply applicant applicants applying based benefits best bring candidate candidates
+closely company culture day days degree desired drive employer employment environment equal etc excellent
+experience experienced familiarity help highly ideal include includes including job join key knowledge
+looking new opportunity people plus position preferred proven provide qualifications related required requirements
+responsibilities responsible role salary skills strong success successful team teams time using want way
+week work working world year years
+""".split())
+
+def _is_keyword(term: str) -> bool:
+    return len(term) >= MIN_LEN and term not in STOPWORDS and not term.replace(".", "").isdigit()
+
+# -------------------- Per-job term cache --------------------
+_lock = threading.Lock()
+_terms: "OrderedDict[Tuple[str, str], Counter]" = OrderedDict()
+
+def term_counts(text: str, job_id: Optional[str] = None) -> Counter:
+    """
+    Token counts of a JD, tokenized once per (job id, text) and kept in a
+    small LRU; ingest, tailoring and ATS scoring all read the same entry.
+    """
+    digest = hashlib.sha1((text or "").encode("utf-8")).hexdigest()
+    key = (str(job_id or ""), digest)
+    with _lock:
+        hit = _terms.get(key)
+        if hit is not None:
+            _terms.move_to_end(key)
+            return hit
+    counts = Counter(tokenize(text))
+    with _lock:
+        _terms[key] = counts
+        while len(_terms) > TERM_CACHE_SIZE:
+            _terms.popitem(last=False)
+    return counts
+
+def doc_terms(text: str, job_id: Optional[str] = None) -> FrozenSet[str]:
+    """Distinct candidate keywords of a document (what term_df counts)."""
+    return frozenset(t for t in term_counts(text, job_id) if _is_keyword(t))
+
+# -------------------- IDF --------------------
+_serial = itertools.count()
+
+class IdfTable:
+    def __init__(self, docs: int, df: Dict[str, int]):
+        self.docs = docs
+        self.df = df
+        self.serial = next(_serial)   # keys cached rankings to this snapshot
+
+    def idf(self, term: str) -> float:
+        # smoothed; a term the corpus has never seen gets the highest weight
+        return math.log((self.docs + 1) / (self.df.get(term, 0) + 1)) + 1.0
+
+_idf_cache: Dict[str, Any] = {"version": None, "table": IdfTable(0, {})}
+_idf_lock = threading.Lock()
+
+def idf_table(version: Any, load_df) -> IdfTable:
+    """IDF snapshot of the corpus, reloaded only when `version` changes."""
+    with _idf_lock:
+        if _idf_cache["version"] != version:
+            docs, df = load_df()
+            _idf_cache["table"] = IdfTable(docs, df)
+            _idf_cache["version"] = version
+        return _idf_cache["table"]
+
+_EMPTY_IDF = IdfTable(0, {})
+IDF_RETRY_SEC = 60.0
+_unavailable: Dict[str, Any] = {"until": 0.0, "logged": False}
+
+def corpus_idf() -> IdfTable:
+    """
+    IDF over the job index; an empty/missing index weighs every term equally.
+    A missing index (the worker container has none) is logged once and only
+    re-checked every IDF_RETRY_SEC.
+    """
+    if time.monotonic() < _unavailable["until"]:
+        return _EMPTY_IDF
+    # imported here: job_index itself imports this module for doc_terms()
+    from job_index import INDEX_DB_PATH, index_version, term_stats
+    try:
+        if not os.path.exists(INDEX_DB_PATH):
+            raise FileNotFoundError(INDEX_DB_PATH)
+        table = idf_table(index_version(), term_stats)
+    except Exception as e:
+        if not _unavailable["logged"]:
+            print(f"[keywords] idf unavailable, weighing terms equally: {e}")
+            _unavailable["logged"] = True
+        _unavailable["until"] = time.monotonic() + IDF_RETRY_SEC
+        return _EMPTY_IDF
+    _unavailable["logged"] = False
+    return table
+
+_ranked: "OrderedDict[Tuple[str, str, int, int], List[str]]" = OrderedDict()
+
+def extract_keywords(jd: str, job_id: Optional[str] = None, limit: int = KEYWORD_LIMIT,
+                     idf: Optional[IdfTable] = None) -> List[str]:
+    """Top `limit` JD terms by tf-idf (stopwords and short/numeric tokens dropped)."""
+    idf = idf or corpus_idf()
+    digest = hashlib.sha1((jd or "").encode("utf-8")).hexdigest()
+    key = (str(job_id or ""), digest, limit, idf.serial)
+    with _lock:
+        hit = _ranked.get(key)
+        if hit is not None:
+            _ranked.move_to_end(key)
+            return hit
+    counts = term_counts(jd, job_id)
+    scored = [(n * idf.idf(t), t) for t, n in counts.items() if _is_keyword(t)]
+    scored.sort(key=lambda x: (-x[0], x[1]))
+    out = [t for _, t in scored[:limit]]
+    with _lock:
+        _ranked[key] = out
+        while len(_ranked) > TERM_CACHE_SIZE:
+            _ranked.popitem(last=False)
+    return out
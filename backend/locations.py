@@ -0,0 +1,236 @@
+# backend/locations.py
+from __future__ import annotations
+import re
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from matcher import LiteralMatcher
+
+# Offline location dictionary. Office strings are resolved to canonical ids
+# once (at ingest); filters are then set intersections. A posting's ids include
+# every ancestor (nyc -> us-ny -> us -> north-america -> americas), so a search
+# for "US" matches a New York office. Remote postings get "remote" plus
+# "remote:<place>" for the region they are open to ("Remote - US" ->
+# remote, remote:us, remote:north-america, ... and us). A remote posting with
+# no region ("Remote", "Anywhere") is remote:anywhere and matches any remote
+# region search.
+
+# id -> (aliases, parents). Aliases are matched on whole words after _norm().
+_PLACES: Dict[str, Tuple[Tuple[str, ...], Tuple[str, ...]]] = {
+    # regions
+    "americas": (("americas", "the americas"), ()),
+    "emea": (("emea",), ()),
+    "apac": (("apac", "asia pacific", "asia-pacific"), ()),
+    "north-america": (("north america",), ("americas",)),
+    "latam": (("latam", "latin america", "south america"), ("americas",)),
+    "europe": (("europe", "eu", "european union"), ("emea",)),
+    "mea": (("middle east", "africa", "mena"), ("emea",)),
+    # countries
+    "us": (("us", "usa", "u s", "u s a", "united states", "united states of america"), ("north-america",)),
+    "ca": (("canada",), ("north-america",)),
+    "mx": (("mexico",), ("latam",)),
+    "br": (("brazil", "brasil"), ("latam",)),
+    "ar": (("argentina",), ("latam",)),
+    "co": (("colombia",), ("latam",)),
+    "uk": (("uk", "u k", "united kingdom", "great britain", "england", "scotland", "wales"), ("europe",)),
+    "ie": (("ireland",), ("europe",)),
+    "de": (("germany", "deutschland"), ("europe",)),
+    "fr": (("france",), ("europe",)),
+    "nl": (("netherlands", "the netherlands", "holland"), ("europe",)),
+    "es": (("spain",), ("europe",)),
+    "pt": (("portugal",), ("europe",)),
+    "it": (("italy",), ("europe",)),
+    "pl": (("poland",), ("europe",)),
+    "se": (("sweden",), ("europe",)),
+    "dk": (("denmark",), ("europe",)),
+    "ch": (("switzerland",), ("europe",)),
+    "il": (("israel",), ("mea",)),
+    "ae": (("uae", "united arab emirates"), ("mea",)),
+    "in": (("india",), ("apac",)),
+    "sg": (("singapore",), ("apac",)),
+    "jp": (("japan",), ("apac",)),
+    "au": (("australia",), ("apac",)),
+    "nz": (("new zealand",), ("apac",)),
+    # US metros
+    "nyc": (("new york", "new york city", "nyc", "manhattan", "brooklyn"), ("us-ny",)),
+    "bay-area": (("bay area", "sf bay area", "silicon valley", "palo alto", "mountain view",
+                  "menlo park", "sunnyvale", "san jose", "oakland", "redwood city"), ("us-ca",)),
+    "sf": (("san francisco", "sf"), ("bay-area",)),
+    "la": (("los angeles", "santa monica"), ("us-ca",)),
+    "seattle": (("seattle", "bellevue", "redmond"), ("us-wa",)),
+    "austin": (("austin",), ("us-tx",)),
+    "boston": (("boston", "cambridge ma"), ("us-ma",)),
+    "chicago": (("chicago",), ("us-il",)),
+    "denver": (("denver", "boulder"), ("us-co",)),
+    "atlanta": (("atlanta",), ("us-ga",)),
+    "dc": (("washington dc", "washington d c", "dc"), ("us",)),
+    "miami": (("miami",), ("us-fl",)),
+    # other metros
+    "toronto": (("toronto",), ("ca",)),
+    "vancouver": (("vancouver",), ("ca",)),
+    "montreal": (("montreal",), ("ca",)),
+    "london": (("london",), ("uk",)),
+    "dublin": (("dublin",), ("ie",)),
+    "berlin": (("berlin",), ("de",)),
+    "munich": (("munich", "munchen"), ("de",)),
+    "paris": (("paris",), ("fr",)),
+    "amsterdam": (("amsterdam",), ("nl",)),
+    "madrid": (("madrid",), ("es",)),
+    "barcelona": (("barcelona",), ("es",)),
+    "lisbon": (("lisbon",), ("pt",)),
+    "warsaw": (("warsaw",), ("pl",)),
+    "stockholm": (("stockholm",), ("se",)),
+    "zurich": (("zurich",), ("ch",)),
+    "tel-aviv": (("tel aviv",), ("il",)),
+    "bangalore": (("bangalore", "bengaluru"), ("in",)),
+    "hyderabad": (("hyderabad",), ("in",)),
+    "pune": (("pune",), ("in",)),
+    "mumbai": (("mumbai",), ("in",)),
+    "delhi-ncr": (("delhi", "new delhi", "gurgaon", "gurugram", "noida"), ("in",)),
+    "chennai": (("chennai",), ("in",)),
+    "tokyo": (("tokyo",), ("jp",)),
+    "sydney": (("sydney",), ("au",)),
+    "melbourne": (("melbourne",), ("au",)),
+    "sao-paulo": (("sao paulo",), ("br",)),
+    "mexico-city": (("mexico city", "cdmx"), ("mx",)),
+}
+
+_US_STATES = {
+    "al": "alabama", "ak": "alaska", "az": "arizona", "ar": "arkansas", "ca": "california",
+    "co": "colorado", "ct": "connecticut", "de": "delaware", "fl": "florida", "ga": "georgia",
+    "hi": "hawaii", "id": "idaho", "il": "illinois", "in": "indiana", "ia": "iowa",
+    "ks": "kansas", "ky": "kentucky", "la": "louisiana", "me": "maine", "md": "maryland",
+    "ma": "massachusetts", "mi": "michigan", "mn": "minnesota", "ms": "mississippi", "mo": "missouri",
+    "mt": "montana", "ne": "nebraska", "nv": "nevada", "nh": "new hampshire", "nj": "new jersey",
+    "nm": "new mexico", "ny": "new york state", "nc": "north carolina", "nd": "north dakota", "oh": "ohio",
+    "ok": "oklahoma", "or": "oregon", "pa": "pennsylvania", "ri": "rhode island", "sc": "south carolina",
+    "sd": "south dakota", "tn": "tennessee", "tx": "texas", "ut": "utah", "vt": "vermont",
+    "va": "virginia", "wa": "washington state", "wv": "west virginia", "wi": "wisconsin", "wy": "wyoming",
+}
+for _code, _name in _US_STATES.items():
+    _PLACES[f"us-{_code}"] = ((_name,), ("us",))
+
+ANYWHERE = "remote:anywhere"
+_REMOTE_WORDS = ("remote", "anywhere", "work from home", "wfh", "distributed", "fully remote")
+
+# "San Francisco, CA" / "Austin, TX (Hybrid)": a trailing two-letter US state code
+_STATE_SUFFIX = re.compile(r",\s*([A-Za-z]{2})\s*(?:\(|,|$)")
+# one office string may list several places: "London / Remote", "NYC; SF", "Berlin or Remote"
+_SEGMENTS = re.compile(r"[;|/\n]|\bor\b", re.I)
+
+def _norm(text: str) -> str:
+    return " ".join(re.sub(r"[^a-z0-9]+", " ", (text or "").lower()).split())
+
+_ALIAS_TO_ID: Dict[str, str] = {}
+for _pid, (_aliases, _) in _PLACES.items():
+    for _a in _aliases:
+        _ALIAS_TO_ID[_norm(_a)] = _pid
+_ALIASES = LiteralMatcher(_ALIAS_TO_ID, word_boundary=True)
+_REMOTE = LiteralMatcher((_norm(w) for w in _REMOTE_WORDS), word_boundary=True)
+
+@lru_cache(maxsize=None)
+def ancestors(pid: str) -> FrozenSet[str]:
+    """`pid` and every region that contains it."""
+    out = {pid}
+    for parent in _PLACES.get(pid, ((), ()))[1]:
+        out |= ancestors(parent)
+    return frozenset(out)
+
+def _drop_covered(ids: Set[str]) -> Set[str]:
+    """Keep the most specific ids: 'san francisco, us' -> {sf}, not {sf, us}."""
+    return {i for i in ids if not any(i != j and i in ancestors(j) for j in ids)}
+
+def _parse_segment(segment: str) -> Tuple[Set[str], bool]:
+    """Most specific place ids mentioned in one segment, and whether it says remote."""
+    norm = _norm(segment)
+    places = {_ALIAS_TO_ID[a] for a in _ALIASES.findall(norm)}
+    m = _STATE_SUFFIX.search(segment)
+    if m and m.group(1).lower() in _US_STATES and all("us" in ancestors(p) for p in places):
+        places.add(f"us-{m.group(1).lower()}")  # not for "Toronto, CA"
+    return _drop_covered(places), _REMOTE.search(norm)
+
+def _leaf_ids(text: str) -> Set[str]:
+    """Most specific ids for one location string: place ids, 'remote', or 'remote:<place>'."""
+    out: Set[str] = set()
+    for segment in _SEGMENTS.split(text or ""):
+        places, remote = _parse_segment(segment)
+        if remote:
+            out |= {f"remote:{p}" for p in places} or {"remote"}
+        else:
+            out |= places
+    return out
+
+@lru_cache(maxsize=4096)
+def _expanded(text: str) -> FrozenSet[str]:
+    ids: Set[str] = set()
+    for leaf in _leaf_ids(text):
+        if leaf.startswith("remote:"):
+            place = leaf[len("remote:"):]
+            ids.add("remote")
+            ids |= {f"remote:{a}" for a in ancestors(place)}
+            ids |= ancestors(place)  # "Remote - US" is also a US job
+        elif leaf == "remote":
+            ids |= {"remote", ANYWHERE}
+        else:
+            ids |= ancestors(leaf)
+    return frozenset(ids)
+
+def location_ids(offices: Iterable[str]) -> List[str]:
+    """Canonical ids (with ancestors) for a posting's office strings; [] when none is recognized."""
+    ids: Set[str] = set()
+    for office in offices:
+        if office:
+            ids |= _expanded(office)
+    return sorted(ids)
+
+class LocationFilter:
+    """
+    Compiled search locations. Each term resolves to its most specific ids;
+    terms the dictionary does not know fall back to a substring check on the
+    posting's location text.
+    """
+
+    def __init__(self, locations: Iterable[str]):
+        ids: Set[str] = set()
+        unresolved: List[str] = []
+        for loc in locations or []:
+            if not (loc or "").strip():
+                continue
+            leaf = _leaf_ids(loc)
+            if any(i.startswith("remote:") for i in leaf):
+                leaf.add(ANYWHERE)
+            if leaf:
+                ids |= leaf
+            else:
+                unresolved.append(loc.strip().lower())
+        self.ids: FrozenSet[str] = frozenset(ids)
+        self.unresolved: Tuple[str, ...] = tuple(unresolved)
+        self._text = LiteralMatcher(self.unresolved)
+
+    def __bool__(self) -> bool:
+        return bool(self.ids or self.unresolved)
+
+    def matches(self, job: Dict[str, Any]) -> bool:
+        """True if the job is in any searched location (ids from ingest, else from its location text)."""
+        ids = job.get("location_ids")
+        if ids is None:
+            ids = _expanded(job.get("location") or "")
+        if self.ids and not self.ids.isdisjoint(ids):
+            return True
+        return bool(self.unresolved) and self._text.search((job.get("location") or "").lower())
+
+    def matches_offices(self, offices: Iterable[str], ids: Optional[Iterable[str]] = None) -> bool:
+        """Connector-side check over every office of a posting."""
+        offices = list(offices)
+        ids = frozenset(ids if ids is not None else location_ids(offices))
+        if self.ids and not self.ids.isdisjoint(ids):
+            return True
+        return bool(self.unresolved) and any(self._text.search((o or "").lower()) for o in offices)
+
+@lru_cache(maxsize=256)
+def _compiled(key: Tuple[str, ...]) -> LocationFilter:
+    return LocationFilter(key)
+
+def location_filter(locations: Optional[Iterable[str]]) -> LocationFilter:
+    """Cached LocationFilter for a search's locations."""
+    return _compiled(tuple(locations or ()))
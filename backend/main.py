@@ -2,20 +2,41 @@ import sys, os
 sys.path.append(os.path.dirname(__file__) or ".")
 
 import os, json
-from datetime import datetime
-from typing import List, Optional, Dict, Any
+from datetime import datetime, timezone
+from typing import List, Optional, Dict, Any, Literal
 
-from fastapi import FastAPI, HTTPException, Request
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
+from fastapi.responses import StreamingResponse, JSONResponse
 from pydantic import BaseModel
 
 # connectors
-from connectors.greenhouse import fetch_greenhouse_jobs
-from connectors.lever import fetch_lever_jobs
+from connectors.fanout import fetch_boards, iter_boards
+from connectors.cache import cache_stats
+from host_scheduler import host_stats
+
+# local job index (FTS5)
+from job_index import (
+    init_index, start_ingest_loop, index_ready, index_version, search_index, all_postings,
+    changes_since, LAST_INGEST,
+)
+
+# server-side result sets + cursors
+from search_cache import ResultCache, result_key, encode_cursor, decode_cursor
+
+# scoring (compiled query plan)
+from scoring import compile_query, score_jobs
+from ranking import BM25Index, corpus_index, tokenize
+from keywords import corpus_idf
+from dedupe import NearDupIndex, corpus_dupes, collapse
+
+# full job descriptions (content-addressed)
+from blob_store import get_text
 
 # tailoring
-from tailor import tailor
+from tailor_pool import shutdown_pool, TAILOR_BATCH_MAX
+from tailor_jobs import TAILOR_JOBS, Overloaded
 
 # drafts / automation
 from automation.drafts import init_db, list_drafts, get_draft, delete_draft
@@ -23,7 +44,7 @@ from automation.autofill_playwright import run_draft
 from playwright.async_api import async_playwright
 
 # >>> apply queue (NEW)
-from apply_db import init_apply, enqueue_application, list_applications  # <-- make sure backend/apply_db.py exists
+from apply_db import init_apply, enqueue_many, applications_page, VALID_STATUSES  # <-- make sure backend/apply_db.py exists
 
 app = FastAPI(title="Agentic Job Assistant API", version="0.5.0")
 
@@ -33,6 +54,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Total-Count", "X-Search-Source", "X-Search-Boards"],
 )
 
 # Serve generated files (DOCX, cover letter, screenshots, DOM snapshots)
@@ -41,6 +63,16 @@ app.mount("/files", StaticFiles(directory="data"), name="files")
 # Env config
 GH_BOARDS = [x.strip() for x in os.getenv("GH_BOARDS","").split(",") if x.strip()]
 LEVER_COMPANIES = [x.strip() for x in os.getenv("LEVER_COMPANIES","").split(",") if x.strip()]
+# answer /search/jobs from the local index once it has been populated
+SEARCH_FROM_INDEX = os.getenv("SEARCH_FROM_INDEX", "1") == "1"
+# /jobs/tailor waits this long on the tailor queue before handing back a job to poll
+TAILOR_SYNC_TIMEOUT_SEC = float(os.getenv("TAILOR_SYNC_TIMEOUT_SEC", "120"))
+TAILOR_RETRY_AFTER_SEC = 5
+
+# per-board outcome of the most recent search (served by /search/status)
+LAST_SEARCH_STATUS: Dict[str, Any] = {"boards": [], "finished_at": None}
+# scored + deduped result sets, keyed by the normalized SearchRequest
+RESULT_CACHE = ResultCache()
 
 # ------------ Models ------------
 class SearchRequest(BaseModel):
@@ -48,6 +80,11 @@ class SearchRequest(BaseModel):
     locations: List[str] = []
     keywords: List[str] = []
     min_score: Optional[int] = 0  # 0–100
+    limit: Optional[int] = None   # page size; None = everything
+    cursor: Optional[str] = None  # from the X-Next-Cursor header of the previous page
+    include_jd: bool = True       # False leaves jd_text out of each posting
+    ranker: Literal["heuristic", "bm25"] = "heuristic"
+    collapse_duplicates: bool = True  # fold near-duplicate postings into one entry + alternates
 
 class JobPosting(BaseModel):
     id: str
@@ -56,14 +93,20 @@ class JobPosting(BaseModel):
     location: str
     source: str
     url: str
-    jd_text: str
+    jd_text: Optional[str] = None   # preview; full text via /jobs/jd/{jd_ref}
+    jd_ref: Optional[str] = None
     score: float
-    created_at: datetime
+    created_at: Optional[datetime] = None   # None when the board's timestamp could not be parsed
+    alternates: List[Dict[str, Any]] = []  # near-duplicates of this posting (other boards/reposts)
 
 class TailorRequest(BaseModel):
     job: Dict[str, Any]
     profile: Optional[Dict[str, Any]] = None
 
+class TailorBatchRequest(BaseModel):
+    jobs: List[Dict[str, Any]]
+    profile: Optional[Dict[str, Any]] = None
+
 class DraftRequest(BaseModel):
     job: Dict[str, Any]
 
@@ -74,63 +117,145 @@ async def _startup():
     init_db()
     # apply queue DB (applications/tasks)
     init_apply()
+    # job index + background ingestion
+    init_index()
+    if SEARCH_FROM_INDEX and (GH_BOARDS or LEVER_COMPANIES):
+        start_ingest_loop(GH_BOARDS, LEVER_COMPANIES, on_ingest=_warm_derived_indexes)
+
+@app.on_event("shutdown")
+async def _shutdown():
+    shutdown_pool()
 
 @app.get("/health")
 def health():
     return {"status": "ok", "gh_boards": GH_BOARDS, "lever_companies": LEVER_COMPANIES}
 
-# ------------ Helpers ------------
-def score_job(j, req: SearchRequest) -> int:
-    title = (j.get("title") or "").lower()
-    jd = (j.get("jd_text") or "").lower()
-    loc_text = (j.get("location") or "").lower()
-
-    raw = (req.roles or []) + (req.keywords or [])
-    tokens = []
-    for item in raw:
-        if not item:
-            continue
-        s = item.lower().strip()
-        tokens.append(s)  # phrase
-        tokens.extend([t for t in s.replace("/", " ").replace("-", " ").split() if t])
-
-    score = 0
-    for t in tokens:
-        if t in title:
-            score += 25
-        elif t in jd:
-            score += 10
-
-    for l in (req.locations or []):
-        if l and l.lower() in loc_text:
-            score += 10
-            break
-
-    if score == 0:
-        score = 50
-    return max(0, min(100, score))
-
 # ------------ Search ------------
-@app.post("/search/jobs", response_model=List[JobPosting])
-def search_jobs(req: SearchRequest):
-    jobs = []
-    # Greenhouse
-    for token in GH_BOARDS:
+@app.post("/search/jobs", response_model=List[JobPosting], response_model_exclude_none=True)
+def search_jobs(req: SearchRequest, response: Response):
+    """
+    Scored postings, best first. Result sets are cached under a hash of the
+    request, so paging with `limit` + `cursor` never re-fetches or re-scores.
+    """
+    use_index = SEARCH_FROM_INDEX and index_ready()
+    version = f"index:{index_version()}" if use_index else "live"
+    options = {"ranker": req.ranker, "collapse": req.collapse_duplicates}
+    offset = 0
+    if req.cursor:
+        # a cursor pages the result set it was issued for: same query, and the
+        # corpus version of that snapshot (which may be older than the current one)
         try:
-            jobs.extend(fetch_greenhouse_jobs(token, req.roles, req.locations))
-        except Exception as e:
-            print(f"[GH] {token} error: {e}")
-    # Lever
-    for company in LEVER_COMPANIES:
-        try:
-            jobs.extend(fetch_lever_jobs(company, req.roles, req.locations))
-        except Exception as e:
-            print(f"[Lever] {company} error: {e}")
+            key, offset, version = decode_cursor(req.cursor)
+        except ValueError:
+            raise HTTPException(400, "Invalid cursor")
+        if key != result_key(req.roles, req.locations, req.keywords, req.min_score, version, options):
+            raise HTTPException(400, "Cursor does not match this search")
+        results = RESULT_CACHE.get(key)
+        if results is None:
+            raise HTTPException(410, "Cursor expired; repeat the search without a cursor")
+        response.headers["X-Search-Source"] = "cache"
+    else:
+        key = result_key(req.roles, req.locations, req.keywords, req.min_score, version, options)
+        results = RESULT_CACHE.get(key)
+        if results is None:
+            results = _run_search(req, response, use_index)
+            RESULT_CACHE.put(key, results)
+        else:
+            response.headers["X-Search-Source"] = "cache"
+
+    end = len(results) if not req.limit else offset + max(1, req.limit)
+    page = results[offset:end]
+    response.headers["X-Total-Count"] = str(len(results))
+    if end < len(results):
+        response.headers["X-Next-Cursor"] = encode_cursor(key, end, version)
+    if not req.include_jd:
+        page = [p.model_copy(update={"jd_text": None}) for p in page]
+    return page
+
+def _run_search(req: SearchRequest, response: Response, use_index: bool) -> List[JobPosting]:
+    if use_index:
+        # role/location filters run inside the FTS5 query; boards as of the last ingest
+        jobs, boards = search_index(req.roles, req.locations), LAST_INGEST["boards"]
+        response.headers["X-Search-Source"] = "index"
+    else:
+        # Greenhouse + Lever, all boards concurrently; slow/failed boards are reported, not fatal
+        jobs, boards = fetch_boards(GH_BOARDS, LEVER_COMPANIES, req.roles, req.locations)
+        LAST_SEARCH_STATUS.update({"boards": boards, "finished_at": datetime.utcnow().isoformat() + "Z"})
+        response.headers["X-Search-Source"] = "live"
+    counts = {k: sum(1 for b in boards if b["status"] == k) for k in ("ok", "error", "rate_limited", "timeout")}
+    response.headers["X-Search-Boards"] = ";".join(f"{k}={v}" for k, v in counts.items())
 
     # Score + filter + sort + dedupe
+    resp = _score_and_filter(jobs, req, use_index)
+    seen = set()
+    dedup: List[JobPosting] = []
+    for r in resp:
+        key = _dedupe_key(r)
+        if key in seen:
+            continue
+        seen.add(key)
+        dedup.append(r)
+    if not req.collapse_duplicates:
+        return dedup
+    # near-duplicates: corpus-wide clusters (index) or clusters over this result set (live)
+    dupes = corpus_dupes(index_version(), all_postings) if use_index else _near_dup_index(dedup)
+    return [
+        head.model_copy(update={"alternates": [_alternate(a) for a in alts]})
+        for head, alts in collapse(dedup, dupes.find)
+    ]
+
+def _near_dup_index(postings: List[JobPosting]) -> NearDupIndex:
+    ix = NearDupIndex()
+    for p in postings:
+        ix.add(p.id, p.title, p.jd_text or "", p.company)
+    return ix
+
+def _alternate(p: JobPosting) -> Dict[str, Any]:
+    return {"id": p.id, "title": p.title, "company": p.company, "source": p.source,
+            "url": p.url, "location": p.location}
+
+def _warm_derived_indexes() -> None:
+    """Rebuild corpus-wide BM25 + near-dup indexes after an ingest pass."""
+    version = index_version()
+    corpus_index(version, all_postings)
+    corpus_dupes(version, all_postings)
+
+def _bm25_scores(jobs: List[Dict[str, Any]], req: SearchRequest, use_index: bool) -> List[int]:
+    """
+    BM25F over the whole stored corpus (index) or over the fetched jobs (live).
+    Live jobs arrive one board batch at a time, so they are scored with the
+    corpus idf, fixed field lengths and a fixed per-query scale: nothing
+    depends on which other postings came in the same batch.
+    """
+    query = " ".join((req.roles or []) + (req.keywords or []))
+    ids = [str(j["id"]) for j in jobs]
+    if use_index:
+        ranked = corpus_index(index_version(), all_postings).rank(query, ids)
+    else:
+        idf = corpus_idf()
+        ranked = BM25Index(jobs, fixed_avg=True).rank(query, ids, weights={t: idf.idf(t) for t in tokenize(query)})
+    return [ranked[i] for i in ids]
+
+def _created_at(value: Any) -> Optional[datetime]:
+    """ISO-8601 or epoch (s/ms, e.g. Lever rows indexed before it was normalized); None if unparseable."""
+    if isinstance(value, datetime):
+        return value
+    try:
+        if isinstance(value, (int, float)) or (isinstance(value, str) and value.strip().isdigit()):
+            ts = float(value)
+            return datetime.fromtimestamp(ts / 1000 if ts > 1e11 else ts, tz=timezone.utc)
+        return datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except (ValueError, OverflowError, OSError):
+        return None
+
+def _score_and_filter(jobs: List[Dict[str, Any]], req: SearchRequest, use_index: bool = False) -> List[JobPosting]:
+    """Score raw postings, drop those under min_score, best first."""
     resp: List[JobPosting] = []
-    for j in jobs:
-        s = score_job(j, req)
+    if req.ranker == "bm25":
+        scores = _bm25_scores(jobs, req, use_index)
+    else:
+        scores = score_jobs(jobs, compile_query(req.roles, req.keywords, req.locations))
+    for j, s in zip(jobs, scores):
         jp = JobPosting(
             id=j["id"],
             title=j["title"],
@@ -139,31 +264,103 @@ def search_jobs(req: SearchRequest):
             source=j["source"],
             url=j["url"],
             jd_text=j["jd_text"],
-            created_at=datetime.fromisoformat(j["created_at"].replace("Z","+00:00")) if isinstance(j["created_at"], str) else j["created_at"],
+            jd_ref=j.get("jd_ref") or None,
+            created_at=_created_at(j.get("created_at")),
             score=s/100.0,
         )
         if (req.min_score or 0) <= s:
             resp.append(jp)
-
     resp.sort(key=lambda x: x.score, reverse=True)
+    return resp
+
+def _dedupe_key(r: JobPosting):
+    return (r.company.lower(), r.title.lower(), r.url)
+
+def _frame(event: str, data: Any, fmt: str) -> str:
+    if fmt == "sse":
+        return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+    return json.dumps({"event": event, "data": data}, default=str) + "\n"
+
+def _stream_search(req: SearchRequest, fmt: str):
+    """
+    Yield scored postings board by board as each connector finishes.
+    Dedupe is incremental (first posting seen wins), so across boards the
+    order is by arrival, not by global score. A near-duplicate of an
+    already-sent posting is sent as an 'alternate' frame naming its canonical id.
+    """
+    use_index = SEARCH_FROM_INDEX and index_ready()
+    if use_index:
+        batches = iter([({"source": "index", "board": "*", "status": "ok"}, search_index(req.roles, req.locations))])
+    else:
+        batches = iter_boards(GH_BOARDS, LEVER_COMPANIES, req.roles, req.locations)
     seen = set()
-    dedup: List[JobPosting] = []
-    for r in resp:
-        key = (r.company.lower(), r.title.lower(), r.url)
-        if key in seen:
-            continue
-        seen.add(key)
-        dedup.append(r)
-    return dedup
+    boards: List[Dict[str, Any]] = []
+    emitted = 0
+    dupes = corpus_dupes(index_version(), all_postings) if use_index else NearDupIndex()
+    canonical: Dict[str, str] = {}  # cluster root -> id of the posting sent for it
+    for status, jobs in batches:
+        for r in _score_and_filter(jobs, req, use_index):
+            key = _dedupe_key(r)
+            if key in seen:
+                continue
+            seen.add(key)
+            if req.collapse_duplicates:
+                root = dupes.find(r.id) if use_index else dupes.add(r.id, r.title, r.jd_text or "", r.company)
+                if root in canonical:
+                    yield _frame("alternate", {"canonical": canonical[root], **_alternate(r)}, fmt)
+                    continue
+                canonical[root] = r.id
+            emitted += 1
+            yield _frame("posting", r.model_dump(mode="json"), fmt)
+        boards.append(status)
+        yield _frame("board", status, fmt)
+    if boards and boards[0]["source"] != "index":
+        LAST_SEARCH_STATUS.update({"boards": boards, "finished_at": datetime.utcnow().isoformat() + "Z"})
+    yield _frame("summary", {"postings": emitted, "boards": boards}, fmt)
+
+@app.post("/search/jobs/stream")
+def search_jobs_stream(req: SearchRequest, format: str = "ndjson"):
+    """Streaming /search/jobs: NDJSON lines or Server-Sent Events, ending with a summary frame."""
+    if format not in ("ndjson", "sse"):
+        raise HTTPException(400, "format must be 'ndjson' or 'sse'")
+    media = "text/event-stream" if format == "sse" else "application/x-ndjson"
+    return StreamingResponse(_stream_search(req, format), media_type=media,
+                             headers={"Cache-Control": "no-cache"})
+
+@app.get("/search/status")
+def search_status():
+    """Per-board status/error summary of the last live search and the last index ingest."""
+    return {**LAST_SEARCH_STATUS, "index": LAST_INGEST}
+
+@app.get("/search/cache")
+def search_cache_stats():
+    """Board response cache counters (hits, revalidations, bytes/latency saved) and result-set cache."""
+    return {**cache_stats(), "result_sets": RESULT_CACHE.stats()}
+
+@app.get("/search/hosts")
+def search_host_stats():
+    """Per-host scheduler state (rate, adaptive concurrency limit) and how long requests waited."""
+    return host_stats()
+
+@app.get("/jobs/changes")
+def jobs_changes(cursor: int = 0, limit: int = 100, ops: str = "insert"):
+    """Postings added (or, with ops=insert,update,remove, changed) since `cursor`."""
+    kinds = [o.strip() for o in ops.split(",") if o.strip()]
+    bad = [o for o in kinds if o not in ("insert", "update", "remove")]
+    if bad:
+        raise HTTPException(400, f"Unknown ops: {', '.join(bad)}")
+    return changes_since(cursor, max(1, min(limit, 1000)), kinds)
+
+@app.get("/jobs/jd/{ref}")
+def job_description(ref: str):
+    """Full job description from the content-addressed blob store."""
+    text = get_text(ref)
+    if text is None:
+        raise HTTPException(404, "Job description not found")
+    return {"jd_ref": ref, "jd_text": text}
 
 # ------------ Tailor ------------
-@app.post("/jobs/tailor")
-def tailor_job(req: TailorRequest, request: Request):
-    job = req.job or {}
-    if not job.get("title"):
-        raise HTTPException(400, "Missing job object")
-    result = tailor(job, req.profile)
-
+def _with_file_urls(result: Dict[str, Any], request: Request) -> Dict[str, Any]:
     # absolute URLs for downloads
     base = str(request.base_url).rstrip("/")  # e.g., http://localhost:8000
     for k in ("resume_docx_path","cover_letter_path"):
@@ -173,6 +370,103 @@ def tailor_job(req: TailorRequest, request: Request):
             result[k.replace("_path","_url")] = f"{base}/files/{filename}"
     return result
 
+def _submit_tailor(job: Dict[str, Any], profile: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    if not job.get("title"):
+        raise HTTPException(400, "Missing job object")
+    try:
+        return TAILOR_JOBS.submit(job, profile)
+    except Overloaded as e:
+        raise HTTPException(503, str(e), headers={"Retry-After": str(TAILOR_RETRY_AFTER_SEC)})
+
+def _job_view(rec: Dict[str, Any], request: Request) -> Dict[str, Any]:
+    if rec.get("result"):
+        rec = {**rec, "result": _with_file_urls(dict(rec["result"]), request)}
+    return {**rec, "status_url": str(request.url_for("tailor_job_status", jid=rec["id"]))}
+
+@app.post("/jobs/tailor")
+async def tailor_job(req: TailorRequest, request: Request):
+    """
+    Tailor one job and return the result. Runs on the background tailor
+    queue, so waiting here holds no worker thread; if it takes longer than
+    TAILOR_SYNC_TIMEOUT_SEC the job record (202) is returned to poll instead.
+    """
+    rec = _submit_tailor(req.job or {}, req.profile)
+    rec = await TAILOR_JOBS.wait(rec["id"], TAILOR_SYNC_TIMEOUT_SEC)
+    if rec["status"] == "done":
+        return _with_file_urls(dict(rec["result"]), request)
+    if rec["status"] == "failed":
+        raise HTTPException(500, rec["error"] or "Tailoring failed")
+    return JSONResponse(_job_view(rec, request), status_code=202)
+
+@app.post("/jobs/tailor/jobs", status_code=202)
+def tailor_job_submit(req: TailorRequest, request: Request):
+    """Queue a tailor job; returns its id and status_url at once. 503 + Retry-After when the queue is full."""
+    return _job_view(_submit_tailor(req.job or {}, req.profile), request)
+
+@app.get("/jobs/tailor/jobs/{jid}", name="tailor_job_status")
+async def tailor_job_status(jid: str, request: Request, wait: float = 0):
+    """Job status (queued | running | done | failed). wait=N long-polls up to N seconds (max 30) for completion."""
+    rec = await TAILOR_JOBS.wait(jid, min(max(wait, 0.0), 30.0))
+    if rec is None:
+        raise HTTPException(404, "Unknown tailor job")
+    return _job_view(rec, request)
+
+@app.get("/jobs/tailor/queue")
+def tailor_queue_stats():
+    return TAILOR_JOBS.stats()
+
+def _batch_item(i: int, job: Dict[str, Any], rec: Dict[str, Any], request: Request) -> Dict[str, Any]:
+    ok = rec["status"] == "done"
+    item = {"index": i, "job_id": job.get("id"), "ok": ok}
+    if ok:
+        item["result"] = _with_file_urls(dict(rec["result"]), request)
+    else:
+        item["error"] = rec.get("error") or rec["status"]
+    return item
+
+@app.post("/jobs/tailor/batch")
+def tailor_batch(req: TailorBatchRequest, request: Request, format: Optional[str] = None):
+    """
+    Tailor many jobs on the background tailor queue (same depth and concurrency
+    limits as single jobs; 503 + Retry-After when it cannot take the whole batch).
+    Returns per-job results in input order, or with format=ndjson|sse streams
+    each one as it finishes (then a summary).
+    A job that fails gets ok=false and an error; the rest of the batch still runs.
+    """
+    if not req.jobs:
+        raise HTTPException(400, "No jobs")
+    limit = min(TAILOR_BATCH_MAX, TAILOR_JOBS.max_queue)
+    if len(req.jobs) > limit:
+        raise HTTPException(400, f"At most {limit} jobs per batch")
+    if format not in (None, "ndjson", "sse"):
+        raise HTTPException(400, "format must be 'ndjson' or 'sse'")
+    try:
+        jids = TAILOR_JOBS.submit_many(req.jobs, req.profile)
+    except Overloaded as e:
+        raise HTTPException(503, str(e), headers={"Retry-After": str(TAILOR_RETRY_AFTER_SEC)})
+    index = {jid: i for i, jid in enumerate(jids)}
+
+    def items():
+        try:
+            for rec in TAILOR_JOBS.as_completed(jids):
+                i = index[rec["id"]]
+                yield _batch_item(i, req.jobs[i], rec, request)
+        finally:
+            TAILOR_JOBS.cancel(jids)   # client went away: drop jobs that have not started
+
+    if format is None:
+        return sorted(items(), key=lambda x: x["index"])
+
+    def frames():
+        ok = 0
+        for item in items():
+            ok += item["ok"]
+            yield _frame("result", item, format)
+        yield _frame("summary", {"jobs": len(req.jobs), "ok": ok, "failed": len(req.jobs) - ok}, format)
+
+    media = "text/event-stream" if format == "sse" else "application/x-ndjson"
+    return StreamingResponse(frames(), media_type=media, headers={"Cache-Control": "no-cache"})
+
 # ------------ Drafts (Playwright) ------------
 @app.get("/applications/drafts")
 def api_list_drafts():
@@ -213,9 +507,33 @@ class ApplyRequest(BaseModel):
 
 @app.post("/apply")
 def apply_jobs(req: ApplyRequest):
-    ids = [enqueue_application(j) for j in (req.jobs or [])]
-    return {"application_ids": ids}
+    """Queue jobs in one write; a posting already queued returns its existing id (listed in `duplicates`)."""
+    queued = enqueue_many(req.jobs or [])
+    ids = [q["task_id"] for q in queued]
+    return {"application_ids": ids, "duplicates": [q["task_id"] for q in queued if q["duplicate"]]}
 
 @app.get("/applications")
-def applications_list():
-    return list_applications()
+def applications_list(response: Response, limit: Optional[int] = None, cursor: Optional[str] = None,
+                      status: Optional[str] = None, portal: Optional[str] = None,
+                      company: Optional[str] = None, include_job: bool = True,
+                      include_artifacts: bool = True):
+    """
+    Applications newest first. Still a plain list; with `limit`, the next
+    page's cursor comes back in X-Next-Cursor. `status` takes a
+    comma-separated list (e.g. QUEUED,IN_PROGRESS).
+    """
+    statuses = [s.strip().upper() for s in (status or "").split(",") if s.strip()]
+    if any(s not in VALID_STATUSES for s in statuses):
+        raise HTTPException(400, f"status must be among {sorted(VALID_STATUSES)}")
+    if limit is not None and limit < 1:
+        raise HTTPException(400, "limit must be >= 1")
+    try:
+        before_id = int(cursor) if cursor else None
+    except ValueError:
+        raise HTTPException(400, "Invalid cursor")
+    page, next_id = applications_page(limit=limit, before_id=before_id, statuses=statuses or None,
+                                      portal=portal, company=company, include_job=include_job,
+                                      include_artifacts=include_artifacts)
+    if next_id is not None:
+        response.headers["X-Next-Cursor"] = str(next_id)
+    return page
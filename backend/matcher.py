@@ -0,0 +1,99 @@
+# backend/matcher.py
+from __future__ import annotations
+import re
+from typing import Dict, FrozenSet, Iterable, Set
+
+_WORD = "a-z0-9"
+# below this many patterns, per-pattern `in` checks (C substring search) beat
+# one regex pass; above it the trie regex wins and keeps scaling
+SCAN_MIN_PATTERNS = 128
+
+def _trie_regex(words: Iterable[str]) -> str:
+    """
+    Factor the words into a trie-shaped regex, e.g. {aws, azure, api} ->
+    a(?:pi|ws|zure). Branches are tried before the 'word ends here' option,
+    so at any position the longest word that fits wins.
+    """
+    trie: Dict[str, dict] = {}
+    for w in words:
+        node = trie
+        for ch in w:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def build(node: Dict[str, dict]) -> str:
+        alts = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not alts:
+            return ""
+        body = alts[0] if len(alts) == 1 else "(?:" + "|".join(alts) + ")"
+        return f"(?:{body})?" if "" in node else body
+
+    return build(trie)
+
+class LiteralMatcher:
+    """
+    Find which of many literal patterns occur in a text in a single regex pass.
+
+    Patterns and texts are expected lowercased by the caller. With
+    word_boundary=True a pattern only counts when it is not glued to other
+    letters/digits ("go" does not match "good").
+
+    The scan restarts one character after each hit, so overlapping
+    occurrences are seen; each position reports its longest match, and the
+    shorter patterns that are prefixes of it are recovered from a
+    precomputed table.
+    The result is exactly the set `{p for p in patterns if p occurs in text}`;
+    small plain (non word-boundary) sets skip the regex and use `in` directly.
+    """
+
+    def __init__(self, patterns: Iterable[str], word_boundary: bool = False):
+        self.patterns: FrozenSet[str] = frozenset(p for p in patterns if p)
+        self.word_boundary = word_boundary
+        self._direct = not word_boundary and len(self.patterns) < SCAN_MIN_PATTERNS
+        body = _trie_regex(self.patterns)
+        if not body:
+            self._rx = None
+        elif word_boundary:
+            self._rx = re.compile(rf"(?<![{_WORD}])({body})(?![{_WORD}])")
+        else:
+            self._rx = re.compile(rf"({body})")
+        # pattern -> every pattern that also matches wherever it matches (its prefixes)
+        self._implied: Dict[str, FrozenSet[str]] = {}
+        for p in self.patterns:
+            implied = {p}
+            for i in range(1, len(p)):
+                q = p[:i]
+                if q in self.patterns and (not word_boundary or not re.match(f"[{_WORD}]", p[i])):
+                    implied.add(q)
+            self._implied[p] = frozenset(implied)
+
+    def findall(self, text: str) -> Set[str]:
+        """Distinct patterns occurring in `text`."""
+        found: Set[str] = set()
+        if self._rx is None or not text:
+            return found
+        if self._direct:
+            return {p for p in self.patterns if p in text}
+        seen: Set[str] = set()
+        search, pos, total = self._rx.search, 0, len(self.patterns)
+        while True:
+            m = search(text, pos)
+            if m is None:
+                break
+            hit = m.group(1)
+            if hit not in seen:
+                seen.add(hit)
+                found |= self._implied[hit]
+                if len(found) == total:
+                    break
+            # restart one char later so overlapping occurrences are not skipped
+            pos = m.start() + 1
+        return found
+
+    def search(self, text: str) -> bool:
+        """True if any pattern occurs in `text`."""
+        if self._rx is None or not text:
+            return False
+        if self._direct:
+            return any(p in text for p in self.patterns)
+        return bool(self._rx.search(text))
@@ -0,0 +1,140 @@
+# backend/ranking.py
+from __future__ import annotations
+import os
+import re
+import threading
+from collections import Counter
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+# BM25F parameters: per-field weight and length normalization
+BM25_K1 = float(os.getenv("BM25_K1", "1.2"))
+# avg_len: typical field length in tokens (jd_text is the ~800-char preview),
+# used instead of the batch average when an index must score on a fixed scale
+FIELDS: Dict[str, Dict[str, float]] = {
+    "title":   {"weight": float(os.getenv("BM25_TITLE_WEIGHT", "3.0")), "b": 0.5,
+                "avg_len": float(os.getenv("BM25_TITLE_AVG_LEN", "5"))},
+    "jd_text": {"weight": float(os.getenv("BM25_JD_WEIGHT", "1.0")),    "b": 0.75,
+                "avg_len": float(os.getenv("BM25_JD_AVG_LEN", "120"))},
+}
+
+_TOKEN = re.compile(r"[a-z0-9\+#\.]+")
+
+def tokenize(text: str) -> List[str]:
+    # same token shape as tailor._tokenize, trailing dots dropped ("python." -> "python")
+    return [t.rstrip(".") for t in _TOKEN.findall((text or "").lower()) if t.rstrip(".")]
+
+class BM25Index:
+    """
+    Term -> postings index over a fixed corpus, stored as one CSR-style
+    triple of NumPy arrays per field (indptr, doc ids, pre-normalized tf).
+    Scoring a query touches only the postings of its terms and never loops
+    over documents in Python.
+    """
+
+    def __init__(self, docs: Sequence[Dict[str, Any]], fixed_avg: bool = False):
+        """fixed_avg: normalize field lengths by FIELDS' avg_len, not by this corpus's average."""
+        self.ids: List[str] = [str(d.get("id")) for d in docs]
+        self.row: Dict[str, int] = {pid: i for i, pid in enumerate(self.ids)}
+        self.n_docs = len(docs)
+        self.vocab: Dict[str, int] = {}
+        pairs: List[np.ndarray] = []
+        self._postings: Dict[str, tuple] = {}
+        for field, cfg in FIELDS.items():
+            terms: List[int] = []
+            docs_: List[int] = []
+            tfs: List[int] = []
+            lens = np.zeros(self.n_docs, dtype=np.float32)
+            vocab = self.vocab
+            for i, d in enumerate(docs):
+                toks = tokenize(d.get(field) or "")
+                lens[i] = len(toks)
+                for t, n in Counter(toks).items():
+                    tid = vocab.get(t)
+                    if tid is None:
+                        tid = vocab[t] = len(vocab)
+                    terms.append(tid); docs_.append(i); tfs.append(n)
+            if fixed_avg:
+                avg = cfg["avg_len"]
+            else:
+                avg = float(lens.mean()) if self.n_docs and lens.mean() > 0 else 1.0
+            norm = (1 - cfg["b"]) + cfg["b"] * (lens / avg)
+            # (term, doc, tf) triples -> term-major CSR
+            terms_a = np.asarray(terms, dtype=np.int64)
+            docs_a = np.asarray(docs_, dtype=np.int64)
+            tfs_a = np.asarray(tfs, dtype=np.float32)
+            order = np.argsort(terms_a, kind="stable")
+            terms_a, docs_a, tfs_a = terms_a[order], docs_a[order], tfs_a[order]
+            vals = (cfg["weight"] * tfs_a / norm[docs_a]).astype(np.float32)
+            self._postings[field] = (terms_a, docs_a, vals)
+            pairs.append(terms_a * max(1, self.n_docs) + docs_a)
+
+        # indptr needs the final vocabulary size (later fields add terms)
+        n_terms = len(self.vocab)
+        for field, (terms_a, docs_a, vals) in self._postings.items():
+            indptr = np.zeros(n_terms + 1, dtype=np.int64)
+            np.cumsum(np.bincount(terms_a, minlength=n_terms), out=indptr[1:])
+            self._postings[field] = (indptr, docs_a, vals)
+
+        # document frequency over the union of fields
+        uniq = np.unique(np.concatenate(pairs)) if pairs else np.zeros(0, dtype=np.int64)
+        df = np.bincount(uniq // max(1, self.n_docs), minlength=n_terms)
+        self.idf = np.log(1 + (self.n_docs - df + 0.5) / (df + 0.5)).astype(np.float32)
+
+    def scores(self, query: str, weights: Optional[Dict[str, float]] = None) -> np.ndarray:
+        """
+        BM25F score of every document for `query` (float32, length n_docs).
+        `weights` (term -> idf) replaces this index's own idf, e.g. with
+        corpus-wide weights when the index only holds one batch.
+        """
+        out = np.zeros(self.n_docs, dtype=np.float32)
+        for t in set(tokenize(query)):
+            tid = self.vocab.get(t)
+            if tid is None:
+                continue
+            idf = self.idf[tid] if weights is None else weights.get(t, 0.0)
+            acc = np.zeros(self.n_docs, dtype=np.float32)
+            for indptr, docs_a, vals in self._postings.values():
+                lo, hi = indptr[tid], indptr[tid + 1]
+                # doc ids are unique within one term's postings, so no add.at needed
+                acc[docs_a[lo:hi]] += vals[lo:hi]
+            hit = acc > 0
+            out[hit] += idf * acc[hit] * (BM25_K1 + 1) / (acc[hit] + BM25_K1)
+        return out
+
+    def rank(self, query: str, ids: Optional[List[str]] = None,
+             weights: Optional[Dict[str, float]] = None) -> Dict[str, int]:
+        """
+        0–100 scores for `ids`, or the whole corpus when ids is None.
+        Without `weights`: relative to the best hit. With `weights`: against
+        the query's ceiling (every term saturated, sum(weight) * (k1 + 1)),
+        a scale that does not depend on which documents are in this index,
+        so scores from separately indexed batches are comparable.
+        """
+        raw = self.scores(query, weights)
+        if ids is None:
+            ids, picked = self.ids, raw
+        else:
+            rows = np.asarray([self.row.get(i, -1) for i in ids], dtype=np.int64)
+            picked = np.zeros(len(ids), dtype=np.float32)
+            known = rows >= 0
+            picked[known] = raw[rows[known]]
+        if weights is None:
+            top = float(picked.max()) if len(picked) else 0.0
+        else:
+            top = sum(weights.get(t, 0.0) for t in set(tokenize(query))) * (BM25_K1 + 1)
+        pct = np.rint(picked / top * 100).astype(int) if top > 0 else np.zeros(len(ids), dtype=int)
+        return dict(zip(ids, pct.tolist()))
+
+# -------------------- Corpus index (job_index) --------------------
+_lock = threading.Lock()
+_cached: Dict[str, Any] = {"version": None, "index": None}
+
+def corpus_index(version: Any, load_docs) -> BM25Index:
+    """BM25 index over the stored postings, rebuilt only when `version` changes."""
+    with _lock:
+        if _cached["index"] is None or _cached["version"] != version:
+            _cached["index"] = BM25Index(load_docs())
+            _cached["version"] = version
+        return _cached["index"]
@@ -0,0 +1,97 @@
+# backend/resume_templates.py
+from __future__ import annotations
+import json
+import hashlib
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+TEMPLATES_DIR = (Path(__file__).resolve().parent / "templates" / "resume")
+DEFAULT_ROLE = "devops"
+
+# simple placeholder fills so output is readable without extra data
+PLACEHOLDERS = {"{X}": "30", "{N}": "5", "{M}": "60", "{period}": "last year"}
+
+# Final minimal inline fallback so Tailor never 500s
+_BUILTIN: Dict[str, Any] = {
+    "summary": "Results-driven engineer with experience aligned to the role.",
+    "core_skills": ["AWS", "Kubernetes", "Terraform", "CI/CD", "Linux"],
+    "bullets": [
+        {"text": "Implemented CI/CD pipelines improving deployment frequency by {X}%.", "tags": ["ci", "cd"]},
+        {"text": "Managed Kubernetes clusters and IaC with Terraform across {N} environments.", "tags": ["kubernetes", "terraform"]},
+        {"text": "Built monitoring with Prometheus/Grafana reducing MTTR by {X}%.", "tags": ["prometheus", "grafana"]},
+    ],
+}
+
+def _fill(text: str) -> str:
+    for k, v in PLACEHOLDERS.items():
+        text = text.replace(k, v)
+    return text
+
+class ResumeTemplate:
+    """
+    A role template parsed once: placeholders filled, tags frozen and
+    lowercased, and a tag -> bullet inverted index so picking bullets for a
+    JD only touches the bullets that share a tag with it.
+    """
+
+    def __init__(self, role: str, data: Dict[str, Any], version: str, mtime: float = 0.0):
+        self.role = role
+        self.version = version          # content hash; changes whenever the file does
+        self.mtime = mtime
+        self.summary: str = data.get("summary", "")
+        self.core_skills: Tuple[str, ...] = tuple(data.get("core_skills", []) or [])
+        bullets = data.get("bullets", []) or []
+        self.bullets: Tuple[str, ...] = tuple(_fill(b["text"]) for b in bullets)
+        self.tags: Tuple[FrozenSet[str], ...] = tuple(
+            frozenset(t.lower() for t in b.get("tags", [])) for b in bullets
+        )
+        index: Dict[str, List[int]] = {}
+        for i, tags in enumerate(self.tags):
+            for t in tags:
+                index.setdefault(t, []).append(i)
+        self.tag_index: Dict[str, Tuple[int, ...]] = {t: tuple(ix) for t, ix in index.items()}
+
+    def choose_bullets(self, jd_keywords: Iterable[str], limit: int = 6) -> List[str]:
+        """Bullets with the most tag overlap first; ties keep template order."""
+        jd_set = set(jd_keywords)
+        overlap: Counter = Counter()
+        small, large = (jd_set, self.tag_index) if len(jd_set) < len(self.tag_index) else (self.tag_index, jd_set)
+        for t in small:
+            if t in large:
+                overlap.update(self.tag_index[t])
+        order = sorted(range(len(self.bullets)), key=lambda i: -overlap[i])
+        return [self.bullets[i] for i in order[:limit]]
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {"role": self.role, "version": self.version, "summary": self.summary,
+                "core_skills": list(self.core_skills), "bullets": len(self.bullets)}
+
+BUILTIN = ResumeTemplate(DEFAULT_ROLE, _BUILTIN, version="builtin")
+
+_lock = threading.Lock()
+_loaded: Dict[Path, ResumeTemplate] = {}
+
+def _load(path: Path, role: str) -> Optional[ResumeTemplate]:
+    """Parsed template for `path`, re-read only when its mtime changed."""
+    try:
+        mtime = path.stat().st_mtime
+    except OSError:
+        return None
+    with _lock:
+        cached = _loaded.get(path)
+        if cached is not None and cached.mtime == mtime:
+            return cached
+    raw = path.read_bytes()
+    tpl = ResumeTemplate(role, json.loads(raw.decode("utf-8")), hashlib.sha1(raw).hexdigest()[:16], mtime)
+    with _lock:
+        _loaded[path] = tpl
+    return tpl
+
+def get_template(role: Optional[str]) -> ResumeTemplate:
+    """backend/templates/resume/<role>.json, falling back to devops.json, then a built-in template."""
+    role = (role or DEFAULT_ROLE).lower()
+    return (_load(TEMPLATES_DIR / f"{role}.json", role)
+            or _load(TEMPLATES_DIR / f"{DEFAULT_ROLE}.json", DEFAULT_ROLE)
+            or BUILTIN)
@@ -0,0 +1,57 @@
+# backend/scoring.py
+from __future__ import annotations
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+from matcher import LiteralMatcher
+from locations import location_filter
+
+TITLE_HIT = 25
+JD_HIT = 10
+LOCATION_HIT = 10
+NO_SIGNAL = 50  # nothing matched at all
+
+class QueryPlan:
+    """
+    A search request compiled once: every role/keyword phrase and its split
+    tokens go into one LiteralMatcher, locations into a LocationFilter.
+    Scoring a job is then two regex passes (title, jd) plus set intersections.
+    """
+
+    def __init__(self, roles: List[str], keywords: List[str], locations: List[str]):
+        tokens: List[str] = []
+        for item in (roles or []) + (keywords or []):
+            if not item:
+                continue
+            s = item.lower().strip()
+            tokens.append(s)  # phrase
+            tokens.extend([t for t in s.replace("/", " ").replace("-", " ").split() if t])
+        # a token listed twice (phrase == token) is counted twice, as before
+        self.weights = Counter(tokens)
+        self.blank = self.weights.pop("", 0)  # "" is 'in' every title
+        self.terms = LiteralMatcher(self.weights)
+        self.locations = location_filter(locations)
+
+    def score(self, job: Dict[str, Any]) -> int:
+        title = (job.get("title") or "").lower()
+        score = self.blank * TITLE_HIT
+        if self.weights:
+            in_title = self.terms.findall(title)
+            score += sum(self.weights[t] for t in in_title) * TITLE_HIT
+            if len(in_title) < len(self.weights):
+                jd = (job.get("jd_text") or "").lower()
+                in_jd = self.terms.findall(jd) - in_title
+                score += sum(self.weights[t] for t in in_jd) * JD_HIT
+        if self.locations and self.locations.matches(job):
+            score += LOCATION_HIT
+        if score == 0:
+            score = NO_SIGNAL
+        return max(0, min(100, score))
+
+def compile_query(roles: Optional[List[str]], keywords: Optional[List[str]], locations: Optional[List[str]]) -> QueryPlan:
+    return QueryPlan(roles or [], keywords or [], locations or [])
+
+def score_jobs(jobs: List[Dict[str, Any]], plan: QueryPlan) -> List[int]:
+    """Score a whole batch against one compiled plan (0–100 each)."""
+    score = plan.score
+    return [score(j) for j in jobs]
@@ -0,0 +1,81 @@
+# backend/search_cache.py
+from __future__ import annotations
+import os
+import json
+import time
+import base64
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+RESULT_CACHE_SIZE = int(os.getenv("SEARCH_RESULT_CACHE_SIZE", "64"))      # result sets kept
+RESULT_CACHE_TTL_SEC = float(os.getenv("SEARCH_RESULT_CACHE_TTL_SEC", "300"))
+
+class ResultCache:
+    """Thread-safe LRU of scored result sets with a per-entry TTL."""
+
+    def __init__(self, max_entries: int = RESULT_CACHE_SIZE, ttl: float = RESULT_CACHE_TTL_SEC):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._items: "OrderedDict[str, Tuple[float, List[Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[List[Any]]:
+        with self._lock:
+            item = self._items.get(key)
+            if item is None or time.monotonic() - item[0] > self.ttl:
+                if item is not None:
+                    del self._items[key]
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return item[1]
+
+    def put(self, key: str, results: List[Any]) -> None:
+        with self._lock:
+            self._items[key] = (time.monotonic(), results)
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_entries:
+                self._items.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"entries": len(self._items), "hits": self.hits, "misses": self.misses,
+                    "max_entries": self.max_entries, "ttl_sec": self.ttl}
+
+def _norm(items: Optional[List[str]]) -> List[str]:
+    return sorted({(x or "").strip().lower() for x in (items or []) if (x or "").strip()})
+
+def result_key(roles: List[str], locations: List[str], keywords: List[str], min_score: Optional[int],
+               version: str, options: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Hash of the normalized search inputs; `version` changes whenever the
+    corpus does, `options` holds anything else that changes the result set.
+    """
+    raw = json.dumps({
+        "roles": _norm(roles), "locations": _norm(locations), "keywords": _norm(keywords),
+        "min_score": int(min_score or 0), "v": version, "options": options or {},
+    }, sort_keys=True)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+# -------------------- Cursors --------------------
+def encode_cursor(key: str, offset: int, version: str = "") -> str:
+    """`version` is the corpus version the result set was built from (see result_key)."""
+    raw = json.dumps({"k": key, "o": offset, "v": version}, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[str, int, str]:
+    """(key, offset, version). Raises ValueError on anything that is not a cursor we issued."""
+    try:
+        pad = "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(cursor + pad))
+        key, offset, version = str(data["k"]), int(data["o"]), str(data.get("v", ""))
+    except Exception as e:
+        raise ValueError("Invalid cursor") from e
+    if offset < 0:
+        raise ValueError("Invalid cursor")
+    return key, offset, version
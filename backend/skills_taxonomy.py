@@ -1,7 +1,13 @@
 # backend/skills_taxonomy.py
 from __future__ import annotations
+import os
 import re
-from typing import Dict, List, Set
+import json
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Set, Tuple
+
+from matcher import LiteralMatcher
 
 ROLE_KEYWORDS: Dict[str, Set[str]] = {
     "devops": {
@@ -28,14 +34,71 @@ ROLE_KEYWORDS: Dict[str, Set[str]] = {
     },
 }
 
+# Extra taxonomies: every *.json in ROLE_TAXONOMY_DIR maps role -> keywords,
+# either a list (weight 1) or {"keyword": weight}. They are merged over the
+# built-in ROLE_KEYWORDS and picked up again when a file changes.
+ROLE_TAXONOMY_DIR = Path(os.getenv("ROLE_TAXONOMY_DIR", str(Path(__file__).resolve().parent / "templates" / "roles")))
+
+class RoleDetector:
+    """
+    Every keyword of every role compiled into one word-boundary LiteralMatcher,
+    so detection is a single pass over the text however many roles there are.
+    A role scores the summed weight of its distinct keywords found.
+    """
+
+    def __init__(self, roles: Dict[str, Dict[str, float]]):
+        self.roles = list(roles)
+        self.by_keyword: Dict[str, List[Tuple[str, float]]] = {}
+        for role, kws in roles.items():
+            for kw, weight in kws.items():
+                self.by_keyword.setdefault(kw, []).append((role, weight))
+        self.matcher = LiteralMatcher(self.by_keyword, word_boundary=True)
+
+    def scores(self, text: str) -> Dict[str, float]:
+        out: Dict[str, float] = {}
+        for kw in self.matcher.findall(text.lower()):
+            for role, weight in self.by_keyword[kw]:
+                out[role] = out.get(role, 0.0) + weight
+        return out
+
+    def detect(self, text: str, default: str = "general") -> str:
+        scores = self.scores(text)
+        best_role, best = default, 0.0
+        for role in self.roles:   # declaration order breaks ties
+            if scores.get(role, 0.0) > best:
+                best_role, best = role, scores[role]
+        return best_role
+
+def _norm_keywords(raw: Any) -> Dict[str, float]:
+    items = raw.items() if isinstance(raw, dict) else ((k, 1.0) for k in raw or [])
+    return {str(k).lower().strip(): float(w) for k, w in items if str(k).strip()}
+
+def _load_taxonomies(files: List[Path]) -> Dict[str, Dict[str, float]]:
+    roles = {role: dict.fromkeys(kws, 1.0) for role, kws in ROLE_KEYWORDS.items()}
+    for path in files:
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            print(f"[skills_taxonomy] skipping {path.name}: {e}")
+            continue
+        for role, kws in data.items():
+            roles.setdefault(role.lower().strip(), {}).update(_norm_keywords(kws))
+    return roles
+
+_lock = threading.Lock()
+_cached: Dict[str, Any] = {"stamp": None, "detector": None}
+
+def role_detector() -> RoleDetector:
+    """The compiled detector, rebuilt only when a taxonomy file is added, removed or modified."""
+    files = sorted(ROLE_TAXONOMY_DIR.glob("*.json")) if ROLE_TAXONOMY_DIR.is_dir() else []
+    stamp = tuple((f.name, f.stat().st_mtime) for f in files)
+    with _lock:
+        if _cached["detector"] is None or _cached["stamp"] != stamp:
+            _cached["detector"] = RoleDetector(_load_taxonomies(files))
+            _cached["stamp"] = stamp
+        return _cached["detector"]
+
 def detect_role(title: str, jd: str, explicit_role: str|None=None) -> str:
     if explicit_role:
         return explicit_role.lower().strip()
-    text = f"{title} {jd}".lower()
-    best_role, best_hits = "general", 0
-    for role, kws in ROLE_KEYWORDS.items():
-        hits = sum(1 for kw in kws if kw in text)
-        if hits > best_hits:
-            best_hits = hits
-            best_role = role
-    return best_role
+    return role_detector().detect(f"{title} {jd}")
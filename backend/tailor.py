@@ -1,80 +1,27 @@
 # backend/tailor.py
 from __future__ import annotations
-import os, json, re
-from datetime import datetime
+import os, json, re, hashlib, threading
 from pathlib import Path
-from typing import Dict, Any, List, Tuple
-from docx import Document
-from docx.shared import Pt
-from docx.enum.text import WD_ALIGN_PARAGRAPH
+from typing import Dict, Any, List, Optional
 
 from skills_taxonomy import detect_role
+from blob_store import get_text
+from resume_templates import ResumeTemplate, get_template
+from docx_writer import paragraph, write_docx
+from keywords import extract_keywords
 
 # Paths
 DATA_DIR = Path("data")  # served by FastAPI via /files
-TEMPLATES_DIR = (Path(__file__).resolve().parent / "templates" / "resume")
 DATA_DIR.mkdir(parents=True, exist_ok=True)
+ARTIFACT_CACHE_DIR = DATA_DIR / "tailor_cache"   # <key>.json -> result of the call that built it
 
-def _nowstamp() -> str:
-    return datetime.utcnow().strftime("%Y%m%d-%H%M%S")
+# bump when the rendering code changes, so old artifacts are not reused
+RENDER_VERSION = "2"
+PROFILE_FIELDS = ("first_name", "last_name", "email", "phone", "linkedin", "role")
 
 def _slug(s: str) -> str:
     return re.sub(r"[^a-z0-9]+", "-", (s or "doc").lower()).strip("-")
 
-def _read_template(role: str) -> Dict[str, Any]:
-    # Prefer on-disk template: backend/templates/resume/<role>.json
-    path = TEMPLATES_DIR / f"{(role or 'devops').lower()}.json"
-    if path.exists():
-        return json.loads(path.read_text(encoding="utf-8"))
-
-    # Fallback to devops.json if specific role missing
-    fallback = TEMPLATES_DIR / "devops.json"
-    if fallback.exists():
-        return json.loads(fallback.read_text(encoding="utf-8"))
-
-    # Final minimal inline fallback so Tailor never 500s
-    return {
-        "summary": "Results-driven engineer with experience aligned to the role.",
-        "core_skills": ["AWS", "Kubernetes", "Terraform", "CI/CD", "Linux"],
-        "bullets": [
-            {"text": "Implemented CI/CD pipelines improving deployment frequency by {X}%.", "tags": ["ci", "cd"]},
-            {"text": "Managed Kubernetes clusters and IaC with Terraform across {N} environments.", "tags": ["kubernetes", "terraform"]},
-            {"text": "Built monitoring with Prometheus/Grafana reducing MTTR by {X}%.", "tags": ["prometheus", "grafana"]},
-        ],
-    }
-
-def _tokenize(text: str) -> List[str]:
-    return re.findall(r"[a-zA-Z0-9\+#\.]+", (text or "").lower())
-
-def _extract_keywords(jd: str) -> List[str]:
-    toks = _tokenize(jd)
-    from collections import Counter
-    cnt = Counter(toks)
-    return [w for w, n in cnt.most_common() if len(w) > 2][:200]
-
-def _choose_bullets(template: Dict[str, Any], jd_keywords: List[str], limit: int = 6) -> List[str]:
-    jd_set = set(jd_keywords)
-    scored: List[Tuple[int, str]] = []
-    for b in template.get("bullets", []):
-        tags = set(t.lower() for t in b.get("tags", []))
-        overlap = len(tags & jd_set)
-        scored.append((overlap, b["text"]))
-    scored.sort(key=lambda x: x[0], reverse=True)
-
-    out: List[str] = []
-    for i, (_, text) in enumerate(scored):
-        if i >= limit:
-            break
-        # simple placeholder fills so output is readable without extra data
-        text = (
-            text.replace("{X}", "30")
-                .replace("{N}", "5")
-                .replace("{M}", "60")
-                .replace("{period}", "last year")
-        )
-        out.append(text)
-    return out
-
 def _profile_from_env(profile: Dict[str, Any] | None) -> Dict[str, Any]:
     p = dict(profile or {})
     p.setdefault("first_name", os.getenv("PROFILE_FIRST_NAME", ""))
@@ -86,58 +33,80 @@ def _profile_from_env(profile: Dict[str, Any] | None) -> Dict[str, Any]:
     p.setdefault("role",       os.getenv("PROFILE_ROLE", ""))
     return p
 
+# -------------------- Artifact memoization --------------------
+def artifact_key(title: str, company: str, profile: Dict[str, Any], tpl: ResumeTemplate,
+                 extra_skills: List[str], picked_bullets: List[str]) -> str:
+    """
+    Hash of everything the documents render; equal keys give identical files.
+    Keyed on the rendered skills/bullets rather than the IDF-ranked keyword
+    list, whose order shifts with every ingest without changing the output.
+    """
+    raw = json.dumps({
+        "title": " ".join(title.split()),
+        "company": " ".join(company.split()),
+        "profile": {f: str(profile.get(f) or "").strip() for f in PROFILE_FIELDS},
+        "template": [tpl.role, tpl.version],
+        "skills": extra_skills,
+        "bullets": picked_bullets,
+        "render": RENDER_VERSION,
+    }, sort_keys=True)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+def _cached_artifacts(key: str) -> Optional[Dict[str, Any]]:
+    """Result of an earlier identical call, if all of its files are still on disk."""
+    try:
+        result = json.loads((ARTIFACT_CACHE_DIR / f"{key}.json").read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    paths = [result.get(k) for k in ("resume_docx_path", "cover_letter_path", "cover_letter_text_path")]
+    if not all(p and Path(p).exists() for p in paths):
+        return None
+    return result
+
+def _store_artifacts(key: str, result: Dict[str, Any]) -> None:
+    ARTIFACT_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    path = ARTIFACT_CACHE_DIR / f"{key}.json"
+    tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp.write_text(json.dumps(result), encoding="utf-8")
+    os.replace(tmp, path)
+
 def _make_ats_docx_resume(
     out_path: Path,
     job: Dict[str, Any],
     profile: Dict[str, Any],
-    template: Dict[str, Any],
+    template: ResumeTemplate,
     picked_bullets: List[str],
-    jd_keywords: List[str],
+    extra_skills: List[str],
 ):
-    doc = Document()
-
-    # Styles
-    style = doc.styles["Normal"]
-    style.font.name = "Calibri"
-    style.font.size = Pt(11)
-
     # Header
     full_name = f"{profile.get('first_name','')} {profile.get('last_name','')}".strip()
-    h = doc.add_paragraph()
-    run = h.add_run(full_name or "Your Name")
-    run.bold = True
-    run.font.size = Pt(16)
-    h.alignment = WD_ALIGN_PARAGRAPH.CENTER
-
-    sub = doc.add_paragraph()
-    sub.add_run(f"{profile.get('email','')} • {profile.get('phone','')} • {profile.get('linkedin','')}")
-    sub.alignment = WD_ALIGN_PARAGRAPH.CENTER
-
-    doc.add_paragraph()  # spacer
+    body = [
+        paragraph(full_name or "Your Name", bold=True, size_pt=16, align="center"),
+        paragraph(f"{profile.get('email','')} • {profile.get('phone','')} • {profile.get('linkedin','')}", align="center"),
+        paragraph(),  # spacer
+    ]
 
     # Summary
-    doc.add_paragraph().add_run("Summary").bold = True
-    doc.add_paragraph(template.get("summary", ""))
+    body += [paragraph("Summary", bold=True), paragraph(template.summary)]
 
     # Core Skills (ATS-friendly)
-    doc.add_paragraph().add_run("Core Skills").bold = True
-    skills = template.get("core_skills", []) or []
-    addl = [k for k in jd_keywords if k.upper() not in [s.upper() for s in skills]][:8]
-    skills_line = ", ".join(skills + addl)
-    doc.add_paragraph(skills_line)
+    body += [paragraph("Core Skills", bold=True), paragraph(", ".join(list(template.core_skills) + extra_skills))]
 
     # Experience Highlights
-    doc.add_paragraph().add_run("Experience Highlights").bold = True
-    for b in picked_bullets:
-        doc.add_paragraph(f"• {b}")
+    body.append(paragraph("Experience Highlights", bold=True))
+    body += [paragraph(f"• {b}") for b in picked_bullets]
 
-    out_path.parent.mkdir(parents=True, exist_ok=True)
-    doc.save(str(out_path))
+    write_docx(out_path, body)
+
+def _extra_skills(template: ResumeTemplate, jd_keywords: List[str], limit: int = 8) -> List[str]:
+    """Top JD keywords the template's core skills do not already list."""
+    upper = {s.upper() for s in template.core_skills}
+    return [k for k in jd_keywords if k.upper() not in upper][:limit]
 
 def _cover_letter_text(
     company: str,
     title: str,
-    template: Dict[str, Any],
+    template: ResumeTemplate,
     picked_bullets: List[str],
     profile: Dict[str, Any],
 ) -> str:
@@ -181,48 +150,54 @@ def tailor(job: Dict[str, Any], profile: Dict[str, Any] | None = None) -> Dict[s
     """
     Build ATS-friendly resume + cover letter tailored to a single job.
     Returns file paths under data/ (your API exposes them as /files/...).
+    A call with the same job, profile and template version returns the
+    files built the first time instead of rendering them again.
     """
     profile = _profile_from_env(profile)
     title = (job.get("title") or "").strip()
     company = (job.get("company") or "").strip()
-    jd = (job.get("jd_text") or "").strip()
+    # full description when the job carries a blob ref; jd_text is only a preview
+    jd = (get_text(job.get("jd_ref")) or job.get("jd_text") or "").strip()
 
     # 1) detect role & load template
     role = detect_role(title, jd, explicit_role=profile.get("role"))
-    tpl = _read_template(role)
+    tpl = get_template(role)
+
+    # 2) JD keywords (tf-idf against the job corpus) & pick bullets (tag index lookup)
+    jd_keywords = extract_keywords(jd, job.get("id"))
+    picked_bullets = tpl.choose_bullets(jd_keywords, limit=6)
 
-    # 2) parse JD keywords & pick bullets
-    jd_keywords = _extract_keywords(jd)
-    picked_bullets = _choose_bullets(tpl, jd_keywords, limit=6)
+    extra_skills = _extra_skills(tpl, jd_keywords)
 
-    # 3) generate ATS resume
-    stamp = _nowstamp()
-    base = f"{_slug(company)}-{_slug(title)}-{stamp}"
+    # 3) score for UI (not part of the memoized documents)
+    scored = {"role_detected": role, "ats_score": _ats_score(list(tpl.core_skills), picked_bullets, jd_keywords)}
+
+    # 4) reuse identical earlier output, else generate ATS resume
+    key = artifact_key(title, company, profile, tpl, extra_skills, picked_bullets)
+    cached = _cached_artifacts(key)
+    if cached is not None:
+        return {**cached, **scored}
+    base = f"{_slug(company)}-{_slug(title)}-{key[:12]}"
     resume_path = DATA_DIR / "resumes" / f"{base}.docx"
-    _make_ats_docx_resume(resume_path, job, profile, tpl, picked_bullets, jd_keywords)
+    _make_ats_docx_resume(resume_path, job, profile, tpl, picked_bullets, extra_skills)
 
-    # 4) generate cover letter (txt + docx)
+    # 5) generate cover letter (txt + docx)
     cl_text = _cover_letter_text(company, title, tpl, picked_bullets, profile)
     cl_txt_path = DATA_DIR / "cover_letters" / f"{base}.txt"
     cl_txt_path.parent.mkdir(parents=True, exist_ok=True)
     cl_txt_path.write_text(cl_text, encoding="utf-8")
 
     cl_docx_path = DATA_DIR / "cover_letters" / f"{base}.docx"
-    cl_doc = Document()
-    for line in cl_text.split("\n"):
-        cl_doc.add_paragraph(line)
-    cl_doc.save(str(cl_docx_path))
-
-    # 5) score for UI
-    ats = _ats_score(tpl.get("core_skills", []), picked_bullets, jd_keywords)
+    write_docx(cl_docx_path, [paragraph(line) for line in cl_text.split("\n")])
 
-    return {
-        "role_detected": role,
+    result = {
         "revised_bullets": picked_bullets,
-        "summary": tpl.get("summary"),
-        "core_skills": tpl.get("core_skills"),
+        "summary": tpl.summary,
+        "core_skills": list(tpl.core_skills),
         "resume_docx_path": str(resume_path),
         "cover_letter_path": str(cl_docx_path),      # docx (upload-friendly)
         "cover_letter_text_path": str(cl_txt_path),  # plaintext preview
-        "ats_score": ats,                             # NEW
+        "artifact_key": key,
     }
+    _store_artifacts(key, result)
+    return {**result, **scored}
@@ -0,0 +1,187 @@
+# backend/tailor_jobs.py
+from __future__ import annotations
+import os
+import time
+import uuid
+import queue
+import asyncio
+import threading
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+from tailor_pool import run_one
+
+# Background tailoring: requests get a job id at once, a fixed set of runner
+# threads works through a bounded queue, and submit() refuses new work when
+# the queue is full instead of letting requests pile up.
+TAILOR_CONCURRENCY = int(os.getenv("TAILOR_CONCURRENCY", "2"))     # jobs running at once
+TAILOR_QUEUE_MAX = int(os.getenv("TAILOR_QUEUE_MAX", "50"))        # jobs waiting to run
+TAILOR_JOB_TTL_SEC = float(os.getenv("TAILOR_JOB_TTL_SEC", "3600"))  # finished jobs kept for polling
+
+class Overloaded(Exception):
+    """The tailor queue is full; retry later."""
+
+def _now() -> str:
+    return datetime.utcnow().isoformat() + "Z"
+
+def _wake(fut: "asyncio.Future") -> None:
+    if not fut.done():
+        fut.set_result(None)
+
+class TailorJobs:
+    def __init__(self, concurrency: int = TAILOR_CONCURRENCY, max_queue: int = TAILOR_QUEUE_MAX,
+                 ttl: float = TAILOR_JOB_TTL_SEC):
+        self.concurrency = max(1, concurrency)
+        self.ttl = ttl
+        self._queue: "queue.Queue[str]" = queue.Queue(maxsize=max(1, max_queue))
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._done: Dict[str, threading.Event] = {}
+        self._inputs: Dict[str, tuple] = {}
+        self._waiters: Dict[str, list] = {}   # jid -> [(loop, future)] of long-polls to wake
+        self._listeners: Dict[str, "queue.Queue[str]"] = {}   # jid -> as_completed() queue to notify
+        self._lock = threading.Lock()
+        self._runners: list = []
+        self.rejected = 0
+
+    @property
+    def max_queue(self) -> int:
+        return self._queue.maxsize
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._runners:
+                return
+            for i in range(self.concurrency):
+                t = threading.Thread(target=self._run, name=f"tailor-{i}", daemon=True)
+                t.start()
+                self._runners.append(t)
+
+    def _expire(self) -> None:
+        cutoff = time.monotonic() - self.ttl
+        with self._lock:
+            old = [jid for jid, j in self._jobs.items() if j.get("_finished", float("inf")) < cutoff]
+            for jid in old:
+                self._jobs.pop(jid, None)
+                self._done.pop(jid, None)
+
+    def _add(self, job: Dict[str, Any], profile: Optional[Dict[str, Any]]) -> str:
+        """New queued record (caller holds the lock)."""
+        jid = uuid.uuid4().hex
+        self._jobs[jid] = {"id": jid, "status": "queued", "job_id": job.get("id"),
+                           "created_at": _now(), "started_at": None, "finished_at": None,
+                           "result": None, "error": None}
+        self._done[jid] = threading.Event()
+        self._inputs[jid] = (job, profile)
+        self._queue.put_nowait(jid)
+        return jid
+
+    def submit(self, job: Dict[str, Any], profile: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Queue one job; raises Overloaded when TAILOR_QUEUE_MAX jobs are already waiting."""
+        return self.get(self.submit_many([job], profile)[0])
+
+    def submit_many(self, jobs: List[Dict[str, Any]], profile: Optional[Dict[str, Any]] = None) -> List[str]:
+        """
+        Queue a batch all-or-nothing; raises Overloaded unless the queue has room
+        for every job. Batches share the queue and runners with single jobs, so
+        they get the same depth and concurrency limits.
+        """
+        self._start()
+        self._expire()
+        with self._lock:
+            free = self._queue.maxsize - self._queue.qsize()
+            if len(jobs) > free:
+                self.rejected += len(jobs)
+                raise Overloaded(f"tailor queue full ({self._queue.maxsize - free} of "
+                                 f"{self._queue.maxsize} waiting, {len(jobs)} requested)")
+            return [self._add(job, profile) for job in jobs]
+
+    def cancel(self, jids: List[str]) -> None:
+        """Drop jobs that have not started yet (e.g. their client went away)."""
+        with self._lock:
+            for jid in jids:
+                rec = self._jobs.get(jid)
+                if rec and rec["status"] == "queued":
+                    self._inputs.pop(jid, None)
+                    rec.update(status="cancelled", finished_at=_now(), _finished=time.monotonic())
+                    self._done[jid].set()
+                    listener = self._listeners.pop(jid, None)
+                    if listener is not None:
+                        listener.put(jid)
+
+    def _run(self) -> None:
+        while True:
+            jid = self._queue.get()
+            with self._lock:
+                if self._jobs.get(jid, {}).get("status") != "queued":
+                    continue   # cancelled while waiting
+                job, profile = self._inputs.pop(jid)
+                self._jobs[jid].update(status="running", started_at=_now())
+            try:
+                outcome = run_one(job, profile)
+            except Exception as e:
+                outcome = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+            with self._lock:
+                rec = self._jobs[jid]
+                rec.update(status="done" if outcome["ok"] else "failed", finished_at=_now(),
+                           result=outcome.get("result"), error=outcome.get("error"),
+                           _finished=time.monotonic())
+                done = self._done[jid]
+                waiters = self._waiters.pop(jid, [])
+                listener = self._listeners.pop(jid, None)
+            done.set()
+            for loop, fut in waiters:
+                loop.call_soon_threadsafe(_wake, fut)
+            if listener is not None:
+                listener.put(jid)
+
+    def as_completed(self, jids: List[str]) -> Iterator[Dict[str, Any]]:
+        """Yield each job's record as it finishes (blocking; for sync handlers and streams)."""
+        finished: "queue.Queue[str]" = queue.Queue()
+        with self._lock:
+            for jid in jids:
+                done = self._done.get(jid)
+                if done is None or done.is_set():
+                    finished.put(jid)
+                else:
+                    self._listeners[jid] = finished
+        for _ in jids:
+            yield self.get(finished.get())
+
+    def get(self, jid: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            rec = self._jobs.get(jid)
+            return {k: v for k, v in rec.items() if not k.startswith("_")} if rec else None
+
+    async def wait(self, jid: str, timeout: float) -> Optional[Dict[str, Any]]:
+        """Long-poll: return once the job has finished or `timeout` passed, without holding a thread."""
+        loop = asyncio.get_running_loop()
+        fut = loop.create_future()
+        with self._lock:
+            done = self._done.get(jid)
+            pending = done is not None and not done.is_set()
+            if pending:   # registered under the lock, so the runner cannot finish unseen
+                self._waiters.setdefault(jid, []).append((loop, fut))
+        if not pending:
+            return self.get(jid)
+        try:
+            await asyncio.wait_for(fut, max(0.0, timeout))
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            with self._lock:
+                waiters = self._waiters.get(jid)
+                if waiters and (loop, fut) in waiters:
+                    waiters.remove((loop, fut))
+                    if not waiters:
+                        del self._waiters[jid]
+        return self.get(jid)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counts: Dict[str, int] = {}
+            for j in self._jobs.values():
+                counts[j["status"]] = counts.get(j["status"], 0) + 1
+        return {"queued": self._queue.qsize(), "max_queue": self._queue.maxsize,
+                "concurrency": self.concurrency, "rejected": self.rejected, "jobs": counts}
+
+TAILOR_JOBS = TailorJobs()
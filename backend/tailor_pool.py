@@ -0,0 +1,69 @@
+# backend/tailor_pool.py
+from __future__ import annotations
+import os
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Optional
+
+from resume_templates import TEMPLATES_DIR, get_template
+from tailor import tailor
+from keywords import corpus_idf
+
+# DOCX construction is CPU-bound and holds the GIL, so batches go to processes.
+TAILOR_WORKERS = int(os.getenv("TAILOR_WORKERS", str(os.cpu_count() or 1)))
+TAILOR_BATCH_MAX = int(os.getenv("TAILOR_BATCH_MAX", "500"))
+
+_lock = threading.Lock()
+_executor: Optional[ProcessPoolExecutor] = None
+
+def _init_worker() -> None:
+    """
+    Parse every role template and load the term_df snapshot once per worker;
+    each job after that is a registry/IDF-cache hit.
+    """
+    for path in TEMPLATES_DIR.glob("*.json"):
+        get_template(path.stem)
+    corpus_idf()
+
+def _pool() -> ProcessPoolExecutor:
+    global _executor
+    with _lock:
+        if _executor is None:
+            # spawn: the API process runs threads (ingest, fan-out) that fork would copy mid-flight
+            _executor = ProcessPoolExecutor(max_workers=TAILOR_WORKERS, initializer=_init_worker,
+                                            mp_context=multiprocessing.get_context("spawn"))
+        return _executor
+
+def _reset_pool(broken: Optional[ProcessPoolExecutor] = None) -> None:
+    """Drop the pool (only if it is still `broken`, when given)."""
+    global _executor
+    with _lock:
+        if _executor is None or (broken is not None and _executor is not broken):
+            return
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+def shutdown_pool() -> None:
+    _reset_pool()
+
+def _run(job: Dict[str, Any], profile: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """One job, never raising: {"ok": True, "result": ...} or {"ok": False, "error": ...}."""
+    if not job.get("title"):
+        return {"ok": False, "error": "Missing job title"}
+    try:
+        return {"ok": True, "result": tailor(job, profile)}
+    except Exception as e:
+        return {"ok": False, "error": f"{type(e).__name__}: {e}"}
+
+def run_one(job: Dict[str, Any], profile: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """One job on the pool (inline with TAILOR_WORKERS=1); blocks the calling thread only."""
+    if TAILOR_WORKERS <= 1:
+        return _run(job, profile)
+    pool = _pool()
+    try:
+        return pool.submit(_run, job, profile).result()
+    except BrokenProcessPool:
+        _reset_pool(pool)
+        return {"ok": False, "error": "tailor worker crashed"}
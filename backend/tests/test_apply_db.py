@@ -0,0 +1,33 @@
+# backend/tests/test_apply_db.py
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ["APPLY_DB_PATH"] = os.path.join(tempfile.mkdtemp(), "apply.sqlite3")
+
+import apply_db  # noqa: E402
+
+
+def test_gh_jid_postings_get_distinct_keys():
+    a = apply_db.idempotency_key({"url": "https://acme.com/careers?gh_jid=111"})
+    b = apply_db.idempotency_key({"url": "https://acme.com/careers?gh_jid=222"})
+    assert a != b
+
+
+def test_tracking_params_and_trailing_slash_are_ignored():
+    a = apply_db.idempotency_key({"url": "https://Acme.com/jobs/1/?utm_source=x&gh_src=y#apply"})
+    b = apply_db.idempotency_key({"url": "https://acme.com/jobs/1"})
+    assert a == b
+
+
+def test_enqueue_many_keeps_gh_jid_postings_apart():
+    apply_db.init_apply()
+    out = apply_db.enqueue_many([
+        {"url": "https://acme.com/careers?gh_jid=111"},
+        {"url": "https://acme.com/careers?gh_jid=222"},
+        {"url": "https://acme.com/careers?gh_jid=111"},
+    ])
+    assert [o["duplicate"] for o in out] == [False, False, True]
+    assert out[0]["application_id"] != out[1]["application_id"]
+    assert out[2]["application_id"] == out[0]["application_id"]
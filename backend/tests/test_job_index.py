@@ -0,0 +1,48 @@
+# backend/tests/test_job_index.py
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+_tmp = tempfile.mkdtemp()
+os.chdir(_tmp)
+os.environ["JOB_INDEX_DB_PATH"] = os.path.join(_tmp, "jobs_index.sqlite3")
+os.environ["JD_BLOB_DIR"] = os.path.join(_tmp, "jd_blobs")
+os.environ["APPLY_DB_PATH"] = os.path.join(_tmp, "apply.sqlite3")
+os.environ["SEARCH_FROM_INDEX"] = "1"
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+import job_index  # noqa: E402
+import main  # noqa: E402
+from connectors import lever  # noqa: E402
+from locations import location_filter  # noqa: E402
+
+LEVER_POSTING = {
+    "id": "abc",
+    "text": "Senior DevOps Engineer",
+    "categories": {"location": "New York"},
+    "hostedUrl": "https://jobs.lever.co/acme/abc",
+    "descriptionPlain": "Kubernetes and Terraform.",
+    "createdAt": 1700000000000,
+}
+
+
+def test_lever_int_created_at_is_searchable_from_index():
+    posting = lever._normalize("acme", LEVER_POSTING, [], location_filter([]))
+    assert posting["created_at"].startswith("2023-11-14T22:13:20")
+
+    job_index.init_index()
+    job_index.sync_board("lever", "acme", [posting])
+    client = TestClient(main.app)
+    for body in ({"roles": ["devops"], "locations": [], "keywords": []},
+                 {"roles": ["devops"], "locations": [], "keywords": [], "ranker": "bm25"}):
+        r = client.post("/search/jobs", json=body)
+        assert r.status_code == 200
+        assert [j["id"] for j in r.json()] == ["lever-acme-abc"]
+        assert r.json()[0]["created_at"].startswith("2023-11-14T22:13:20")
+
+
+def test_unparseable_created_at_does_not_fail_the_search():
+    assert main._created_at("1700000000000").year == 2023
+    assert main._created_at("not a date") is None